@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+
+import degrees
+from graph import source_stamps
+from landmarks import LANDMARKS, LandmarkIndex
+from nameindex import POLICIES
+
+USAGE = ("Usage: python batch.py [--compact] [--landmarks] [--workers N] "
+         "[--names strict|popular|fuzzy] [--serve socket] directory [queries]")
+
+# LandmarkIndex answering hub queries by lookup, if --landmarks is given
+landmarks = None
+
+# How names matching several people, or none exactly, are resolved
+name_policy = "strict"
+
+
+def main():
+    global landmarks, name_policy
+    options, args = parse_args(sys.argv[1:])
+    if len(args) not in (1, 2):
+        sys.exit(USAGE)
+    directory = args[0]
+    queries = args[1] if len(args) == 2 else "-"
+
+    # Load data once; every query below reuses it
+    print("Loading data...", file=sys.stderr)
+    if options["compact"] or options["landmarks"]:
+        degrees.load_graph(directory)
+    else:
+        degrees.load_data(directory)
+    if options["landmarks"]:
+        path = os.path.join(directory, LANDMARKS)
+        try:
+            landmarks = LandmarkIndex(degrees.graph, path,
+                                      source_stamps(directory))
+        except (OSError, ValueError) as e:
+            sys.exit(f"Could not load landmarks: {e}")
+    name_policy = options["names"]
+    # Only fuzzy lookups need the trigram index; build it before forking
+    if name_policy == "fuzzy":
+        degrees.name_index()
+    print("Data loaded.", file=sys.stderr)
+
+    # Forked workers inherit the loaded data instead of reloading it
+    pool = None
+    if options["workers"] > 1:
+        context = multiprocessing.get_context("fork")
+        pool = context.Pool(options["workers"])
+
+    try:
+        if options["serve"] is not None:
+            try:
+                serve(options["serve"], pool)
+            except FileExistsError as e:
+                sys.exit(f"Could not serve: {e}")
+        elif queries == "-":
+            run(sys.stdin, sys.stdout, pool)
+        else:
+            with open(queries, encoding="utf-8") as f:
+                run(f, sys.stdout, pool)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def parse_args(argv):
+    """
+    Splits command-line arguments into a dictionary of options
+    and a list of the remaining positional arguments.
+    """
+    options = {
+        "compact": False, "landmarks": False, "workers": 1, "serve": None,
+        "names": "strict",
+    }
+    args = []
+    argv = list(argv)
+    while argv:
+        arg = argv.pop(0)
+        if arg in ("--compact", "--landmarks"):
+            options[arg[2:]] = True
+        elif arg in ("--workers", "--serve", "--names"):
+            if not argv:
+                sys.exit(USAGE)
+            options[arg[2:]] = argv.pop(0)
+        else:
+            args.append(arg)
+    try:
+        options["workers"] = int(options["workers"])
+    except ValueError:
+        sys.exit(USAGE)
+    if options["workers"] < 1 or options["names"] not in POLICIES:
+        sys.exit(USAGE)
+    return options, args
+
+
+def run(lines, out, pool=None):
+    """
+    Answers one query per line of lines, writing one result line
+    to out per query as soon as it is available, in input order.
+    Queries are fanned out to pool's worker processes if given.
+    """
+    queries = (line for line in lines if line.strip())
+    if pool is None:
+        results = map(answer, queries)
+    else:
+        results = pool.imap(answer, queries, chunksize=16)
+    for result in results:
+        out.write(result + "\n")
+        out.flush()
+
+
+def serve(path, pool=None):
+    """
+    Keeps the loaded data resident and answers queries sent over
+    a Unix socket at path, one query per line, until interrupted or
+    terminated. Raises FileExistsError if something other than a
+    stale socket is already at path.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode("utf-8") for line in self.rfile)
+            out = _SocketWriter(self.wfile)
+            run(lines, out, pool)
+
+    _remove_stale_socket(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        print(f"Serving on {path}", file=sys.stderr)
+        # Stop on SIGTERM as on Ctrl-C, so the socket is removed either way
+        previous = signal.signal(signal.SIGTERM, _interrupt)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            os.remove(path)
+
+
+def _remove_stale_socket(path):
+    """
+    Removes a socket left at path by a server that is no longer
+    running. Raises FileExistsError if path is anything else,
+    including the socket of a server still answering there.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except ConnectionRefusedError:
+            os.remove(path)
+            return
+    raise FileExistsError(f"a server is already listening on {path}")
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def answer(line):
+    """
+    Answers a query line of two tab-separated names, returning
+    the names, the degrees of separation and the connecting path,
+    all tab-separated.
+    """
+    names = line.rstrip("\n").split("\t")
+    if len(names) != 2:
+        return f"{line.strip()}\terror: expected two tab-separated names"
+    source_name, target_name = (name.strip() for name in names)
+
+    source = degrees.person_id_for_name(source_name, name_policy)
+    target = degrees.person_id_for_name(target_name, name_policy)
+    prefix = f"{source_name}\t{target_name}"
+    for name, person_id in ((source_name, source), (target_name, target)):
+        if person_id is None:
+            return f"{prefix}\terror: {name} not found or ambiguous"
+
+    # Landmark lookups answer hub queries; anything else falls back to BFS
+    exact = False
+    if landmarks is not None:
+        path, exact = landmarks.shortest_path(source, target)
+    if not exact and degrees.graph is not None:
+        path = degrees.graph.shortest_path(source, target)
+    elif not exact:
+        path = degrees.bidirectional_shortest_path(source, target)
+    if path is None:
+        return f"{prefix}\tnot connected"
+
+    steps = [degrees.person(source)["name"]]
+    for movie_id, person_id in path:
+        steps.append(degrees.movie_info(movie_id)["title"])
+        steps.append(degrees.person(person_id)["name"])
+    return f"{prefix}\t{len(path)}\t" + " > ".join(steps)
+
+
+class _SocketWriter():
+    """Adapts a binary socket stream to the text interface run expects."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.wfile.flush()
+
+
+if __name__ == "__main__":
+    main()
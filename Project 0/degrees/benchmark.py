@@ -0,0 +1,261 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import resource
+import time
+from array import array
+
+import degrees
+import landmarks
+from graph import CompactGraph, source_stamps
+
+# Search engines the benchmark can run, by name: compact builds its
+# graph from the CSV files, while snapshot opens the cached snapshot
+# and landmarks also answers what it can from the landmark file
+ENGINES = ("bfs", "bidirectional", "movie", "compact", "snapshot",
+           "landmarks")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark degrees.py search engines on synthetic data."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser(
+        "generate", help="write a synthetic scale-free dataset"
+    )
+    generate_parser.add_argument("directory")
+    generate_parser.add_argument("--people", type=int, default=10000)
+    generate_parser.add_argument("--movies", type=int, default=None,
+                                 help="defaults to half the people")
+    generate_parser.add_argument("--cast", type=int, default=8,
+                                 help="mean cast size per movie")
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    run_parser = commands.add_parser(
+        "run", help="time a fixed query workload on each engine"
+    )
+    run_parser.add_argument("directory")
+    run_parser.add_argument("--queries", type=int, default=200)
+    run_parser.add_argument("--engines", default=",".join(ENGINES),
+                            help="comma-separated subset of "
+                                 + ", ".join(ENGINES))
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--landmarks", type=int, default=16,
+                            help="landmarks to build if the landmark file "
+                                 "is missing or out of date")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        movies = args.movies or max(1, args.people // 2)
+        generate(args.directory, args.people, movies, args.cast, args.seed)
+    else:
+        engines = args.engines.split(",")
+        for engine in engines:
+            if engine not in ENGINES:
+                parser.error(f"unknown engine {engine!r}")
+        run(args.directory, engines, args.queries, args.seed,
+            args.landmarks)
+
+
+def generate(directory, people, movies, cast, seed=0):
+    """
+    Writes people.csv, movies.csv and stars.csv for a synthetic dataset
+    whose co-star graph is scale-free: each cast slot goes to a person
+    chosen in proportion to how many movies they are already in, so a
+    few hub actors collect most of the roles.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, "people.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for p in range(people):
+            writer.writerow([p, f"Person {p}", 1900 + rng.randrange(120)])
+
+    with open(os.path.join(directory, "movies.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for m in range(movies):
+            writer.writerow([m, f"Movie {m}", 1900 + rng.randrange(120)])
+
+    # Every role so far, so that choosing a random role picks a person
+    # in proportion to their number of movies (preferential attachment)
+    roles = array("I")
+    with open(os.path.join(directory, "stars.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        for m in range(movies):
+            size = 1 + min(int(rng.expovariate(1 / cast)), 10 * cast)
+            stars = set()
+            for _ in range(size):
+                if roles and rng.random() < 0.5:
+                    stars.add(roles[rng.randrange(len(roles))])
+                else:
+                    stars.add(rng.randrange(people))
+            for p in stars:
+                writer.writerow([p, m])
+                roles.append(p)
+
+
+def run(directory, engines, queries, seed=0, k=16):
+    """
+    Runs the same random workload of queries through each engine in a
+    fresh process and prints load time, latency percentiles, people
+    expanded per query and peak resident memory.
+
+    The snapshot and landmark files are brought up to date first, so
+    that load times measure opening them rather than building them.
+    """
+    context = multiprocessing.get_context("fork")
+    if "snapshot" in engines or "landmarks" in engines:
+        process = context.Process(
+            target=_prepare, args=(directory, "landmarks" in engines, k)
+        )
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise SystemExit("Could not prepare the snapshot or landmarks")
+
+    print(f"{'engine':<14} {'load s':>8} {'p50 ms':>9} {'p90 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'expanded':>10} {'RSS MB':>8}")
+    for engine in engines:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_measure, args=(sender, directory, engine, queries, seed)
+        )
+        process.start()
+        sender.close()
+        report = receiver.recv()
+        process.join()
+
+        latencies = sorted(report["latencies"])
+        if not latencies:
+            print(f"{engine:<14} {report['load']:>8.2f} "
+                  f"{'-':>9} {'-':>9} {'-':>9} {'-':>9} {'-':>10} "
+                  f"{report['rss'] / 1024:>8.1f}")
+            continue
+        print(f"{engine:<14} {report['load']:>8.2f} "
+              f"{_percentile(latencies, 50) * 1000:>9.3f} "
+              f"{_percentile(latencies, 90) * 1000:>9.3f} "
+              f"{_percentile(latencies, 99) * 1000:>9.3f} "
+              f"{latencies[-1] * 1000:>9.3f} "
+              f"{report['expanded'] / len(latencies):>10.1f} "
+              f"{report['rss'] / 1024:>8.1f}")
+
+
+def workload(person_ids, queries, seed=0):
+    """Returns a fixed list of (source, target) pairs for a seed."""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(person_ids), rng.choice(person_ids))
+        for _ in range(queries)
+    ]
+
+
+def _prepare(directory, with_landmarks, k):
+    """
+    Writes the graph snapshot, and the landmark file if asked for,
+    unless they already match the CSV files.
+    """
+    graph = CompactGraph.cached(directory)
+    if with_landmarks:
+        path = os.path.join(directory, landmarks.LANDMARKS)
+        sources = source_stamps(directory)
+        try:
+            landmarks.LandmarkIndex(graph, path, sources)
+        except (OSError, ValueError):
+            print(f"Building {k} landmarks...")
+            landmarks.build(graph, k, path, sources)
+
+
+def _measure(sender, directory, engine, queries, seed):
+    """
+    Loads the data for one engine, runs the workload through it and
+    sends the measurements back. Runs in its own process so peak RSS
+    only reflects this engine.
+    """
+    expanded = [0]
+
+    start = time.perf_counter()
+    if engine in ("compact", "snapshot", "landmarks"):
+        if engine == "compact":
+            graph = CompactGraph.from_csv(directory)
+        else:
+            graph = CompactGraph.cached(directory)
+        person_ids = [
+            graph.person_ids[p] for p in range(len(graph.person_ids))
+            if graph.person_offsets[p + 1] > graph.person_offsets[p]
+        ]
+        neighbors = graph.neighbors
+
+        def counted_neighbors(p):
+            expanded[0] += 1
+            return neighbors(p)
+        graph.neighbors = counted_neighbors
+        search = graph.shortest_path
+
+        # Landmark lookups answer what they can, as in batch.py
+        if engine == "landmarks":
+            index = landmarks.LandmarkIndex(
+                graph, os.path.join(directory, landmarks.LANDMARKS),
+                source_stamps(directory)
+            )
+
+            def landmark_shortest_path(source, target):
+                path, exact = index.shortest_path(source, target)
+                if not exact:
+                    path = graph.shortest_path(source, target)
+                return path
+            search = landmark_shortest_path
+    else:
+        degrees.load_data(directory)
+        person_ids = [
+            person_id for person_id, person in degrees.people.items()
+            if person["movies"]
+        ]
+        neighbors_for_person = degrees.neighbors_for_person
+
+        def counted_neighbors_for_person(person_id):
+            expanded[0] += 1
+            return neighbors_for_person(person_id)
+        degrees.neighbors_for_person = counted_neighbors_for_person
+        search = {
+            "bfs": degrees.shortest_path,
+            "bidirectional": degrees.bidirectional_shortest_path,
+            "movie": degrees.movie_shortest_path,
+        }[engine]
+    load = time.perf_counter() - start
+
+    latencies = []
+    for source, target in workload(sorted(person_ids), queries, seed):
+        start = time.perf_counter()
+        search(source, target)
+        latencies.append(time.perf_counter() - start)
+        if engine == "movie":
+            expanded[0] += degrees.search_stats["people_expanded"]
+
+    sender.send({
+        "load": load,
+        "latencies": latencies,
+        "expanded": expanded[0],
+        "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    sender.close()
+
+
+def _percentile(values, percent):
+    """Returns the nearest-rank percentile of sorted values."""
+    rank = max(1, -(-percent * len(values) // 100))
+    return values[rank - 1]
+
+
+if __name__ == "__main__":
+    main()
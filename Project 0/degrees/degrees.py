@@ -1,7 +1,10 @@
 import csv
+import itertools
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from graph import CompactGraph
+from nameindex import NameIndex, POLICIES
+from util import Node, IndexedQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,6 +15,22 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Work done by the most recent movie_shortest_path call, for benchmarking
+search_stats = {
+    "people_expanded": 0,
+    "movies_scanned": 0,
+    "stars_scanned": 0,
+    "parents_recorded": 0,
+}
+
+# Integer-indexed CompactGraph, used instead of the dictionaries above
+# when the data is loaded with load_graph
+graph = None
+
+# NameIndex over whichever representation is loaded, built on first use
+# by the fuzzy name policy
+_name_index = None
+
 
 def load_data(directory):
     """
@@ -52,14 +71,30 @@ def load_data(directory):
                 pass
 
 
+def load_graph(directory):
+    """
+    Load data into a compact integer-indexed graph, reusing the
+    directory's binary snapshot when it is newer than the CSV files.
+    """
+    global graph
+    graph = CompactGraph.cached(directory)
+
+
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    compact = "--compact" in args
+    if compact:
+        args.remove("--compact")
+    if len(args) > 1:
+        sys.exit("Usage: python degrees.py [--compact] [directory]")
+    directory = args[0] if args else "large"
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    if compact:
+        load_graph(directory)
+    else:
+        load_data(directory)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +104,10 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    if graph is not None:
+        path = graph.shortest_path(source, target)
+    else:
+        path = bidirectional_shortest_path(source, target)
 
     if path is None:
         print("Not connected.")
@@ -78,9 +116,9 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = person(path[i][1])["name"]
+            person2 = person(path[i + 1][1])["name"]
+            movie = movie_info(path[i + 1][0])["title"]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
@@ -94,7 +132,7 @@ def shortest_path(source, target):
 
     # Initialize frontier to just the starting position
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = IndexedQueueFrontier()
     frontier.add(start)
 
     # Initialize an empty explored set
@@ -129,22 +167,251 @@ def shortest_path(source, target):
                     path.reverse()
                     return path
                 frontier.add(child)
-    
 
-def person_id_for_name(name):
+
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching from both
+    ends at once and meeting in the middle.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # Each side maps a reached person to (movie_id, person_id) of the
+    # person it was reached from, or None for the side's starting person
+    forward = {source: None}
+    backward = {target: None}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    while forward_layer and backward_layer:
+
+        # Always grow the smaller frontier by one full layer
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting = _expand_layer(
+                forward_layer, forward, backward
+            )
+        else:
+            backward_layer, meeting = _expand_layer(
+                backward_layer, backward, forward
+            )
+
+        if meeting is not None:
+            return _join_paths(meeting, forward, backward)
+
+    return None
+
+
+def _expand_layer(layer, parents, other):
+    """
+    Expands every person in layer by one step, recording parents.
+    Returns the next layer and a person reached by both searches,
+    or None if the searches have not met yet.
+    """
+    next_layer = []
+    for person_id in layer:
+        for movie_id, neighbor_id in neighbors_for_person(person_id):
+            if neighbor_id in parents:
+                continue
+            parents[neighbor_id] = (movie_id, person_id)
+            next_layer.append(neighbor_id)
+            if neighbor_id in other:
+                # Every meeting found in this layer closes a path of the
+                # same length, so the first one is a shortest path
+                return next_layer, neighbor_id
+    return next_layer, None
+
+
+def _join_paths(meeting, forward, backward):
+    """
+    Joins the forward and backward parent chains at the meeting person
+    into a list of (movie_id, person_id) pairs from source to target.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent_id
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child_id = backward[person_id]
+        path.append((movie_id, child_id))
+        person_id = child_id
+    return path
+
+
+def movie_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, treating movies as
+    intermediate nodes so each movie's cast is scanned at most once.
+
+    If no possible path, returns None.
+    """
+    for key in search_stats:
+        search_stats[key] = 0
+    if source == target:
+        return []
+
+    # On the compact graph, search over indices and only look up the
+    # IDs of the people and movies on the path found
+    if graph is not None:
+        path = _movie_search(
+            graph.person_index[source], graph.person_index[target],
+            graph.movies_of, graph.stars_of
+        )
+        if path is None:
+            return None
+        return [(graph.movie_ids[m], graph.person_ids[p]) for m, p in path]
+    return _movie_search(
+        source, target,
+        lambda person_id: people[person_id]["movies"],
+        lambda movie_id: movies[movie_id]["stars"]
+    )
+
+
+def _movie_search(source, target, movies_of, stars_of):
+    """
+    Runs the search of movie_shortest_path from source to target,
+    finding the movies of a person with movies_of and the people in
+    a movie with stars_of, and returns the path of (movie, person)
+    pairs, or None.
+    """
+    # Maps each reached person to the (movie, person) it was reached
+    # from, or None for the source
+    parents = {source: None}
+    movies_seen = set()
+    layer = [source]
+
+    while layer:
+        next_layer = []
+        for person in layer:
+            search_stats["people_expanded"] += 1
+            for movie in movies_of(person):
+                if movie in movies_seen:
+                    continue
+                movies_seen.add(movie)
+                search_stats["movies_scanned"] += 1
+                for star in stars_of(movie):
+                    search_stats["stars_scanned"] += 1
+                    if star in parents:
+                        continue
+                    parents[star] = (movie, person)
+                    search_stats["parents_recorded"] += 1
+                    if star == target:
+                        return _join_paths(target, parents, {target: None})
+                    next_layer.append(star)
+        layer = next_layer
+
+    return None
+
+
+def all_shortest_paths(source, target, k=None):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, or only the first k.
+
+    A single breadth-first search records, for each person, every
+    (movie_id, person_id) it can be reached from one layer closer to
+    the source; paths are then generated lazily by walking those
+    predecessors back from the target, without searching again.
+    """
+    paths = _walk_predecessors(source, target, _predecessors(source, target))
+    if k is not None:
+        paths = itertools.islice(paths, k)
+    yield from paths
+
+
+def _predecessors(source, target):
+    """
+    Returns a dictionary mapping each person on some shortest path
+    from source to target to the list of (movie_id, person_id) pairs
+    it can be reached from, or None if the two are not connected.
+    """
+    distance = {source: 0}
+    predecessors = {source: []}
+    layer = [source]
+    while layer and target not in distance:
+        next_layer = []
+        for person_id in layer:
+            for movie_id, neighbor_id in neighbors_for_person(person_id):
+                if neighbor_id not in distance:
+                    distance[neighbor_id] = distance[person_id] + 1
+                    predecessors[neighbor_id] = []
+                    next_layer.append(neighbor_id)
+                if distance[neighbor_id] == distance[person_id] + 1:
+                    predecessors[neighbor_id].append((movie_id, person_id))
+        layer = next_layer
+
+    if target not in distance:
+        return None
+    return predecessors
+
+
+def _walk_predecessors(source, target, predecessors):
+    """
+    Yields each path from source to target through predecessors,
+    one at a time, using an explicit stack of partial paths.
+    """
+    if predecessors is None:
+        return
+    if source == target:
+        yield []
+        return
+
+    # Each entry is a person and the path from them to the target
+    stack = [(target, [])]
+    while stack:
+        person_id, suffix = stack.pop()
+        for movie_id, previous_id in reversed(predecessors[person_id]):
+            path = [(movie_id, person_id)] + suffix
+            if previous_id == source:
+                yield path
+            else:
+                stack.append((previous_id, path))
+
+
+def name_index():
+    """
+    Returns the NameIndex for the loaded data, building it on first use.
+    """
+    global _name_index
+    if _name_index is None:
+        if graph is not None:
+            _name_index = NameIndex.from_graph(graph)
+        else:
+            _name_index = NameIndex.from_people(people)
+    return _name_index
+
+
+def person_id_for_name(name, policy="ask"):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    With the default "ask" policy ambiguities are resolved by
+    prompting; any of nameindex.POLICIES resolves them without input.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    if graph is not None:
+        person_ids = sorted(graph.person_ids_for_name(name))
+    else:
+        person_ids = sorted(names.get(name.lower(), set()))
+    if policy != "ask":
+        return _resolve(name, person_ids, policy)
+
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
+            name = person(person_id)["name"]
+            birth = person(person_id)["birth"]
             print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
         try:
             person_id = input("Intended Person ID: ")
@@ -157,11 +424,61 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def _resolve(name, person_ids, policy):
+    """
+    Chooses one of person_ids, the people called name, by policy
+    without prompting. Only the fuzzy policy builds the NameIndex,
+    and only when nobody is called name exactly.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown name policy {policy!r}")
+    if len(person_ids) == 1:
+        return person_ids[0]
+    elif person_ids:
+        if policy == "strict":
+            return None
+        # The one in the most movies, ties going to the lowest ID
+        return max(person_ids, key=_movie_count)
+    elif policy == "fuzzy":
+        return name_index().resolve(name, policy)
+    return None
+
+
+def _movie_count(person_id):
+    """Returns the number of movies a person starred in."""
+    if graph is not None:
+        p = graph.person_index[person_id]
+        return graph.person_offsets[p + 1] - graph.person_offsets[p]
+    return len(people[person_id]["movies"])
+
+
+def person(person_id):
+    """
+    Returns the name and birth of a person from whichever
+    representation the data was loaded into.
+    """
+    if graph is not None:
+        return graph.person(person_id)
+    return people[person_id]
+
+
+def movie_info(movie_id):
+    """
+    Returns the title and year of a movie from whichever
+    representation the data was loaded into.
+    """
+    if graph is not None:
+        return graph.movie(movie_id)
+    return movies[movie_id]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return graph.neighbors_for_person(person_id)
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
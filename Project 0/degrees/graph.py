@@ -0,0 +1,465 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Files a dataset directory is built from, checked to invalidate snapshots
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+# Name of the binary snapshot written next to the CSV files
+SNAPSHOT = "graph.snapshot"
+
+SNAPSHOT_MAGIC = b"DEGSNAP2"
+
+# Adjacency arrays stored raw in a snapshot, in file order
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars")
+
+# String tables stored in a snapshot, each as an array of byte offsets
+# into a block of UTF-8 text
+STRINGS = ("person_ids", "person_names", "births", "movie_ids", "titles",
+           "years")
+
+# Person indices sorted by ID and by lowercase name, and movie indices
+# sorted by ID, stored in a snapshot so lookups can bisect them in place
+ORDERS = ("person_id_order", "person_name_order", "movie_id_order")
+
+
+class CompactGraph():
+    """
+    Actor/movie graph with IMDb IDs interned to dense ints.
+
+    Adjacency is stored CSR-style: the movies of person p are
+    person_movies[person_offsets[p]:person_offsets[p + 1]], and the
+    stars of movie m are movie_stars[movie_offsets[m]:movie_offsets[m + 1]].
+    """
+
+    def __init__(self, person_ids, person_names, births,
+                 movie_ids, titles, years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_index=None, movie_index=None):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.births = births
+        self.movie_ids = movie_ids
+        self.titles = titles
+        self.years = years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        self.person_index = person_index or _index(person_ids)
+        self.movie_index = movie_index or _index(movie_ids)
+        self.names = _names(person_names)
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Builds a graph straight from the CSV files in directory,
+        without going through the nested dictionaries of degrees.py.
+        """
+        person_ids, person_names, births = [], [], []
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                person_ids.append(row["id"])
+                person_names.append(row["name"])
+                births.append(row["birth"])
+
+        movie_ids, titles, years = [], [], []
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                movie_ids.append(row["id"])
+                titles.append(row["title"])
+                years.append(row["year"])
+
+        person_index = _index(person_ids)
+        movie_index = _index(movie_ids)
+
+        # Collect (person, movie) edges, skipping unknown IDs like load_data
+        edge_people = array("I")
+        edge_movies = array("I")
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                p = person_index.get(row["person_id"])
+                m = movie_index.get(row["movie_id"])
+                if p is None or m is None:
+                    continue
+                edge_people.append(p)
+                edge_movies.append(m)
+
+        person_offsets, person_movies = _csr(
+            len(person_ids), edge_people, edge_movies
+        )
+        movie_offsets, movie_stars = _csr(
+            len(movie_ids), edge_movies, edge_people
+        )
+        return cls(person_ids, person_names, births,
+                   movie_ids, titles, years,
+                   person_offsets, person_movies, movie_offsets, movie_stars,
+                   person_index, movie_index)
+
+    @classmethod
+    def cached(cls, directory):
+        """
+        Loads the graph for directory from its binary snapshot if the
+        snapshot matches the current CSV files, otherwise builds it from
+        the CSV files and writes a fresh snapshot for the next run.
+        """
+        path = os.path.join(directory, SNAPSHOT)
+        sources = source_stamps(directory)
+        try:
+            graph = SnapshotGraph(path)
+        except (OSError, ValueError):
+            pass
+        else:
+            if graph.sources == sources:
+                return graph
+
+        graph = cls.from_csv(directory)
+        try:
+            graph.save(path, sources)
+        except OSError:
+            # Read-only dataset directories just go without a snapshot
+            pass
+        return graph
+
+    def save(self, path, sources=None):
+        """
+        Writes the graph to path as a header followed by raw arrays:
+        the adjacency arrays, each string table as offsets and text,
+        and the sort orders used to look up IDs and names.
+        """
+        blocks = [(name, getattr(self, name)) for name in ARRAYS]
+        for name in STRINGS:
+            offsets, text = _string_table(getattr(self, name))
+            blocks.append((f"{name}_offsets", offsets))
+            blocks.append((f"{name}_text", text))
+        person_ids = self.person_ids
+        person_names = self.person_names
+        movie_ids = self.movie_ids
+        blocks.append(("person_id_order", array("I", sorted(
+            range(len(person_ids)), key=lambda p: person_ids[p]
+        ))))
+        blocks.append(("person_name_order", array("I", sorted(
+            range(len(person_names)), key=lambda p: person_names[p].lower()
+        ))))
+        blocks.append(("movie_id_order", array("I", sorted(
+            range(len(movie_ids)), key=lambda m: movie_ids[m]
+        ))))
+
+        header = {
+            "byteorder": sys.byteorder,
+            "itemsize": array("I").itemsize,
+            "sources": sources or {},
+            "arrays": {},
+        }
+        # Offsets are relative to the body, which starts after the
+        # header padded to an 8 byte boundary; every array is padded
+        # to 8 bytes too so each can be cast in place
+        body = 0
+        for name, block in blocks:
+            length = len(block) * block.itemsize
+            header["arrays"][name] = [body, length, block.typecode]
+            body = _align(body + length)
+
+        encoded = json.dumps(header).encode("utf-8")
+        start = _align(len(SNAPSHOT_MAGIC) + 8 + len(encoded))
+
+        partial = f"{path}.partial"
+        with open(partial, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<Q", len(encoded)))
+            f.write(encoded)
+            for name, block in blocks:
+                f.write(bytes(start + header["arrays"][name][0] - f.tell()))
+                block.tofile(f)
+        os.replace(partial, path)
+
+    def movies_of(self, p):
+        """Returns the movie indices person index p starred in."""
+        return self.person_movies[
+            self.person_offsets[p]:self.person_offsets[p + 1]
+        ]
+
+    def stars_of(self, m):
+        """Returns the person indices who starred in movie index m."""
+        return self.movie_stars[
+            self.movie_offsets[m]:self.movie_offsets[m + 1]
+        ]
+
+    def neighbors(self, p):
+        """
+        Yields (movie, person) index pairs for people
+        who starred with person index p.
+        """
+        for m in self.movies_of(p):
+            for q in self.stars_of(m):
+                yield m, q
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        return {
+            (self.movie_ids[m], self.person_ids[q])
+            for m, q in self.neighbors(self.person_index[person_id])
+        }
+
+    def person(self, person_id):
+        """Returns a dictionary of name and birth for a person_id."""
+        p = self.person_index[person_id]
+        return {"name": self.person_names[p], "birth": self.births[p]}
+
+    def movie(self, movie_id):
+        """Returns a dictionary of title and year for a movie_id."""
+        m = self.movie_index[movie_id]
+        return {"title": self.titles[m], "year": self.years[m]}
+
+    def person_ids_for_name(self, name):
+        """Returns the set of person_ids with the given name."""
+        return {self.person_ids[p] for p in self.names.get(name.lower(), ())}
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, using a bidirectional
+        search over person indices.
+
+        If no possible path, returns None.
+        """
+        path = self.index_path(
+            self.person_index[source], self.person_index[target]
+        )
+        if path is None:
+            return None
+        return [(self.movie_ids[m], self.person_ids[p]) for m, p in path]
+
+    def index_path(self, source, target):
+        """
+        Returns the shortest list of (movie, person) index pairs
+        from person index source to person index target, or None.
+        """
+        if source == target:
+            return []
+
+        forward = {source: None}
+        backward = {target: None}
+        forward_layer = [source]
+        backward_layer = [target]
+
+        while forward_layer and backward_layer:
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self._expand_layer(
+                    forward_layer, forward, backward
+                )
+            else:
+                backward_layer, meeting = self._expand_layer(
+                    backward_layer, backward, forward
+                )
+            if meeting is not None:
+                return _join_paths(meeting, forward, backward)
+
+        return None
+
+    def _expand_layer(self, layer, parents, other):
+        """
+        Expands every person in layer by one step, recording parents.
+        Returns the next layer and a person reached by both searches,
+        or None if the searches have not met yet.
+        """
+        next_layer = []
+        for p in layer:
+            for m, q in self.neighbors(p):
+                if q in parents:
+                    continue
+                parents[q] = (m, p)
+                next_layer.append(q)
+                if q in other:
+                    return next_layer, q
+        return next_layer, None
+
+
+class SnapshotGraph(CompactGraph):
+    """
+    CompactGraph backed by a memory-mapped snapshot file.
+
+    Every table is a view straight into the mapping, so opening a
+    snapshot reads almost nothing, and pages are only read when a
+    search or lookup touches them. IDs and names are found by binary
+    search over sort orders stored in the snapshot, rather than by
+    building dictionaries.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot")
+        position = len(SNAPSHOT_MAGIC)
+        length, = struct.unpack_from("<Q", self._map, position)
+        position += 8
+        header = json.loads(self._map[position:position + length])
+        if (header["byteorder"] != sys.byteorder
+                or header["itemsize"] != array("I").itemsize):
+            raise ValueError(f"{path} was written on another platform")
+
+        start = _align(position + length)
+        view = memoryview(self._map)
+        arrays = {}
+        for name, (offset, length, typecode) in header["arrays"].items():
+            offset += start
+            arrays[name] = view[offset:offset + length].cast(typecode)
+
+        for name in ARRAYS + ORDERS:
+            setattr(self, name, arrays[name])
+        for name in STRINGS:
+            setattr(self, name, StringTable(arrays[f"{name}_offsets"],
+                                            arrays[f"{name}_text"]))
+        self.person_index = SortedIndex(self.person_id_order, self.person_ids)
+        self.movie_index = SortedIndex(self.movie_id_order, self.movie_ids)
+        self.sources = header["sources"]
+
+    def person_ids_for_name(self, name):
+        """Returns the set of person_ids with the given name."""
+        key = name.lower()
+        names = self.person_names
+        order = self.person_name_order
+        start = bisect_left(order, key, key=lambda p: names[p].lower())
+        end = bisect_right(order, key, start, key=lambda p: names[p].lower())
+        return {self.person_ids[order[i]] for i in range(start, end)}
+
+
+class StringTable():
+    """
+    Sequence of strings stored as UTF-8 text, string i being the
+    bytes between offsets[i] and offsets[i + 1].
+    """
+
+    def __init__(self, offsets, text):
+        self.offsets = offsets
+        self.text = text
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("string table index out of range")
+        i %= len(self)
+        return str(self.text[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class SortedIndex():
+    """
+    Read-only mapping from each string of a table to its position,
+    found by binary search over the positions sorted by string.
+    """
+
+    def __init__(self, order, strings):
+        self.order = order
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, key):
+        i = bisect_left(self.order, key, key=self.strings.__getitem__)
+        if i < len(self.order) and self.strings[self.order[i]] == key:
+            return self.order[i]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def source_stamps(directory):
+    """
+    Returns the modification time and size of each source CSV file,
+    used to tell whether a snapshot is still current.
+    """
+    stamps = {}
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps[name] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def _align(offset, alignment=8):
+    """Rounds offset up to a multiple of alignment."""
+    return -(-offset // alignment) * alignment
+
+
+def _string_table(strings):
+    """
+    Returns the offsets and UTF-8 text arrays that store strings
+    as a StringTable.
+    """
+    offsets = array("Q", [0])
+    text = array("B")
+    for string in strings:
+        text.frombytes(string.encode("utf-8"))
+        offsets.append(len(text))
+    return offsets, text
+
+
+def _names(person_names):
+    """Maps each lowercase name to the person indices that have it."""
+    names = {}
+    for i, name in enumerate(person_names):
+        names.setdefault(name.lower(), []).append(i)
+    return names
+
+
+def _index(ids):
+    """Maps each ID to its position in ids."""
+    return {id_: i for i, id_ in enumerate(ids)}
+
+
+def _csr(count, sources, targets):
+    """
+    Groups targets by source into CSR offsets and values arrays,
+    using a counting sort over the source indices.
+    """
+    offsets = array("I", [0]) * (count + 1)
+    for s in sources:
+        offsets[s + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    values = array("I", [0]) * len(targets)
+    position = array("I", offsets)
+    for s, t in zip(sources, targets):
+        values[position[s]] = t
+        position[s] += 1
+    return offsets, values
+
+
+def _join_paths(meeting, forward, backward):
+    """
+    Joins the forward and backward parent chains at the meeting person
+    into a list of (movie, person) pairs from source to target.
+    """
+    path = []
+    p = meeting
+    while forward[p] is not None:
+        m, parent = forward[p]
+        path.append((m, p))
+        p = parent
+    path.reverse()
+
+    p = meeting
+    while backward[p] is not None:
+        m, child = backward[p]
+        path.append((m, child))
+        p = child
+    return path
@@ -0,0 +1,268 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from graph import CompactGraph, source_stamps
+
+# Name of the landmark file written next to the CSV files
+LANDMARKS = "landmarks.bin"
+
+LANDMARKS_MAGIC = b"DEGLMRK2"
+
+# Distance stored for people a landmark cannot reach
+UNREACHABLE = 0xFFFF
+
+# Per-landmark arrays, each with one entry per person, and their typecodes
+ARRAYS = (("distance", "H"), ("parent_person", "i"), ("parent_movie", "i"))
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python landmarks.py directory [k]")
+    directory = sys.argv[1]
+    k = int(sys.argv[2]) if len(sys.argv) == 3 else 16
+
+    print("Loading data...")
+    graph = CompactGraph.cached(directory)
+    print(f"Running BFS from the {k} most connected people...")
+    path = os.path.join(directory, LANDMARKS)
+    build(graph, k, path, source_stamps(directory))
+    print(f"Landmarks written to {path}.")
+
+
+def most_connected(graph, k):
+    """
+    Returns the k person indices with the most co-star edges,
+    counting a co-star once per shared movie.
+    """
+    def connections(p):
+        return sum(
+            graph.movie_offsets[m + 1] - graph.movie_offsets[m] - 1
+            for m in graph.movies_of(p)
+        )
+    people = range(len(graph.person_offsets) - 1)
+    return sorted(people, key=connections, reverse=True)[:k]
+
+
+def single_source(graph, source):
+    """
+    Runs a breadth-first search from person index source over the
+    whole graph, scanning each movie's cast once.
+
+    Returns arrays of each person's distance from source and of the
+    (person, movie) it was reached from, or -1 if it was not.
+    """
+    count = len(graph.person_offsets) - 1
+    distance = array("H", [UNREACHABLE]) * count
+    parent_person = array("i", [-1]) * count
+    parent_movie = array("i", [-1]) * count
+    movie_seen = bytearray(len(graph.movie_offsets) - 1)
+
+    distance[source] = 0
+    layer = [source]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for p in layer:
+            for m in graph.movies_of(p):
+                if movie_seen[m]:
+                    continue
+                movie_seen[m] = 1
+                for q in graph.stars_of(m):
+                    if distance[q] == UNREACHABLE:
+                        distance[q] = depth
+                        parent_person[q] = p
+                        parent_movie[q] = m
+                        next_layer.append(q)
+        layer = next_layer
+    return distance, parent_person, parent_movie
+
+
+def build(graph, k, path, sources):
+    """
+    Runs single_source from the k most connected people and writes
+    their distance and parent arrays to path, along with the stamps
+    of the source CSV files the graph was built from.
+    """
+    landmarks = most_connected(graph, k)
+    header = {
+        "byteorder": sys.byteorder,
+        "sources": sources,
+        "people": len(graph.person_offsets) - 1,
+        "movies": len(graph.movie_offsets) - 1,
+        "landmarks": landmarks,
+    }
+    encoded = json.dumps(header).encode("utf-8")
+
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(LANDMARKS_MAGIC)
+        f.write(struct.pack("<Q", len(encoded)))
+        f.write(encoded)
+        f.write(bytes(_align(f.tell()) - f.tell()))
+        for landmark in landmarks:
+            for values in single_source(graph, landmark):
+                values.tofile(f)
+                f.write(bytes(_align(f.tell()) - f.tell()))
+    os.replace(partial, path)
+
+
+class LandmarkIndex():
+    """
+    Memory-mapped single-source BFS results for a set of landmark
+    people, answering distance and path queries by lookup.
+
+    The file is only accepted if it was built from source CSV files
+    with the given stamps, so that edits to the data cannot make it
+    return paths through edges that no longer exist.
+    """
+
+    def __init__(self, graph, path, sources):
+        self.graph = graph
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(LANDMARKS_MAGIC)] != LANDMARKS_MAGIC:
+            raise ValueError(f"{path} is not a landmark file")
+        position = len(LANDMARKS_MAGIC)
+        length, = struct.unpack_from("<Q", self._map, position)
+        position += 8
+        header = json.loads(self._map[position:position + length])
+        count = len(graph.person_offsets) - 1
+        if (header["byteorder"] != sys.byteorder
+                or header["sources"] != sources
+                or header["people"] != count
+                or header["movies"] != len(graph.movie_offsets) - 1):
+            raise ValueError(f"{path} does not match the loaded graph")
+
+        # Lay out the views in the same order build wrote the arrays
+        view = memoryview(self._map)
+        offset = _align(position + length)
+        self.landmarks = {}
+        self.tables = []
+        for i, landmark in enumerate(header["landmarks"]):
+            table = {}
+            for name, typecode in ARRAYS:
+                size = count * array(typecode).itemsize
+                table[name] = view[offset:offset + size].cast(typecode)
+                offset = _align(offset + size)
+            self.landmarks[landmark] = i
+            self.tables.append(table)
+
+    def distance_bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the distance between person
+        indices source and target from the triangle inequality over
+        all landmarks. upper is None if no landmark reaches both.
+        """
+        lower, upper = 0, None
+        for table in self.tables:
+            s = table["distance"][source]
+            t = table["distance"][target]
+            if s == UNREACHABLE or t == UNREACHABLE:
+                if s != t:
+                    # One side is reachable and the other is not
+                    return None, None
+                continue
+            lower = max(lower, abs(s - t))
+            if upper is None or s + t < upper:
+                upper = s + t
+        return lower, upper
+
+    def index_path(self, source, target):
+        """
+        Returns a (movie, person) index path from source to target
+        through the best landmark, and whether it is known to be a
+        shortest path. Returns (None, True) if they are not connected
+        and (None, False) if no landmark reaches both of them.
+        """
+        if source == target:
+            return [], True
+        if source in self.landmarks:
+            table = self.tables[self.landmarks[source]]
+            if table["distance"][target] == UNREACHABLE:
+                return None, True
+            return self._from_landmark(table, target), True
+        if target in self.landmarks:
+            table = self.tables[self.landmarks[target]]
+            if table["distance"][source] == UNREACHABLE:
+                return None, True
+            return self._to_landmark(table, source), True
+
+        lower, upper = self.distance_bounds(source, target)
+        if upper is None:
+            return None, lower is None
+        for table in self.tables:
+            s = table["distance"][source]
+            t = table["distance"][target]
+            if s != UNREACHABLE and s + t == upper:
+                path = (self._to_landmark(table, source)
+                        + self._from_landmark(table, target))
+                path = _remove_cycles(source, path)
+                return path, len(path) == lower
+
+    def shortest_path(self, source, target):
+        """
+        Returns a list of (movie_id, person_id) pairs connecting the
+        source to the target via landmark lookups, and whether it is
+        known to be a shortest path. The path is None if the two are
+        not connected or no landmark reaches both of them.
+        """
+        graph = self.graph
+        path, exact = self.index_path(
+            graph.person_index[source], graph.person_index[target]
+        )
+        if path is not None:
+            path = [(graph.movie_ids[m], graph.person_ids[p]) for m, p in path]
+        return path, exact
+
+    def _from_landmark(self, table, target):
+        """Returns the (movie, person) path from a landmark to target."""
+        path = []
+        p = target
+        while table["parent_person"][p] != -1:
+            path.append((table["parent_movie"][p], p))
+            p = table["parent_person"][p]
+        path.reverse()
+        return path
+
+    def _to_landmark(self, table, source):
+        """Returns the (movie, person) path from source to a landmark."""
+        path = []
+        p = source
+        while table["parent_person"][p] != -1:
+            parent = table["parent_person"][p]
+            path.append((table["parent_movie"][p], parent))
+            p = parent
+        return path
+
+
+def _remove_cycles(source, path):
+    """
+    Shortcuts any part of a path that returns to a person already
+    on it, which joining two landmark paths can produce.
+    """
+    result = []
+    position = {source: 0}
+    for m, p in path:
+        if p in position:
+            del result[position[p]:]
+            position = {source: 0}
+            for i, (_, q) in enumerate(result):
+                position[q] = i + 1
+            continue
+        result.append((m, p))
+        position[p] = len(result)
+    return result
+
+
+def _align(offset, alignment=8):
+    """Rounds offset up to a multiple of alignment."""
+    return -(-offset // alignment) * alignment
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from heapq import heappush, heappushpop, nlargest
+
+# A ranked match for a name lookup; higher scores are better matches
+Candidate = namedtuple("Candidate", ["person_id", "name", "birth", "score"])
+
+# Non-interactive ways of choosing one person for a name:
+#   strict  - only a unique exact match
+#   popular - the exact match who starred in the most movies
+#   fuzzy   - like popular, falling back to the best prefix or
+#             typo-tolerant match when there is no exact match
+POLICIES = ("strict", "popular", "fuzzy")
+
+# Lowest trigram similarity the fuzzy policy will accept
+FUZZY_THRESHOLD = 0.4
+
+# Trigrams shared by more entries than this are only used to gather
+# fuzzy candidates when there are too few rarer ones
+COMMON_TRIGRAM = 500
+
+# Most trigrams of a name that one typo can change: swapping two
+# letters changes the four trigrams that overlap them
+TYPO_TRIGRAMS = 4
+
+
+class NameIndex():
+    """
+    Sorted index of lowercase names for exact and prefix lookups,
+    plus a trigram index for typo-tolerant matching.
+    """
+
+    def __init__(self, entries):
+        """
+        Builds the index from (person_id, name, birth, popularity)
+        tuples, where popularity breaks ties between equal matches.
+        """
+        entries = sorted(entries, key=lambda entry: entry[1].lower())
+        self.keys = [entry[1].lower() for entry in entries]
+        self.person_ids = [entry[0] for entry in entries]
+        self.names = [entry[1] for entry in entries]
+        self.births = [entry[2] for entry in entries]
+        self.popularity = array("I", (entry[3] for entry in entries))
+
+        # Positions of the entries with each trigram, in increasing
+        # order, and a number for each trigram. Entry i has the trigrams
+        # numbered key_trigrams[trigram_offsets[i]:trigram_offsets[i + 1]]
+        self.trigrams = {}
+        self.trigram_ids = {}
+        self.key_trigrams = array("I")
+        self.trigram_offsets = array("Q", [0])
+        for i, key in enumerate(self.keys):
+            for trigram in _trigrams(key):
+                if trigram not in self.trigrams:
+                    self.trigrams[trigram] = array("I")
+                    self.trigram_ids[trigram] = len(self.trigram_ids)
+                self.trigrams[trigram].append(i)
+                self.key_trigrams.append(self.trigram_ids[trigram])
+            self.trigram_offsets.append(len(self.key_trigrams))
+
+    @classmethod
+    def from_people(cls, people):
+        """Builds the index from the people dictionary of degrees.py."""
+        return cls(
+            (person_id, person["name"], person["birth"], len(person["movies"]))
+            for person_id, person in people.items()
+        )
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Builds the index from a CompactGraph."""
+        offsets = graph.person_offsets
+        return cls(
+            (person_id, graph.person_names[p], graph.births[p],
+             offsets[p + 1] - offsets[p])
+            for p, person_id in enumerate(graph.person_ids)
+        )
+
+    def exact(self, name):
+        """Returns candidates whose name equals name, ignoring case."""
+        key = name.lower()
+        start = bisect_left(self.keys, key)
+        end = start
+        while end < len(self.keys) and self.keys[end] == key:
+            end += 1
+        return self._ranked(range(start, end), 1.0)
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to limit candidates whose name starts with prefix,
+        ignoring case, most popular first.
+        """
+        key = prefix.lower()
+        if not key:
+            return []
+        start = bisect_left(self.keys, key)
+        end = bisect_left(self.keys, key + "\uffff", start)
+        positions = nlargest(limit, range(start, end),
+                             key=lambda i: self.popularity[i])
+        return [
+            self._candidate(i, len(key) / len(self.keys[i]))
+            for i in positions
+        ]
+
+    def fuzzy(self, name, limit=10, threshold=FUZZY_THRESHOLD):
+        """
+        Returns up to limit candidates ranked by the trigram
+        similarity of their name to name, leaving out those less
+        similar than threshold.
+
+        Candidates are gathered from the rarest trigrams of name, so a
+        name that differs from it by more than one typo can be missed.
+        """
+        query = _trigrams(name.lower())
+        if not query:
+            return []
+        size = len(query)
+        postings = sorted(
+            (self.trigrams.get(trigram, ()) for trigram in query), key=len
+        )
+        numbers = {
+            self.trigram_ids[trigram] for trigram in query
+            if trigram in self.trigram_ids
+        }
+
+        # The name that was meant is in all but TYPO_TRIGRAMS of the
+        # lists of the query's trigrams, so candidates are counted over
+        # the rarest few and any other rare ones, and only kept if they
+        # are in enough of them. A match also shares at least needed
+        # trigrams to reach threshold
+        needed = max(1, math.ceil(threshold * size - 1e-9))
+        rare = min(size, TYPO_TRIGRAMS + 3)
+        while rare < size and len(postings[rare]) <= COMMON_TRIGRAM:
+            rare += 1
+        shared = Counter()
+        for positions in postings[:rare]:
+            shared.update(positions)
+        fewest = max(needed - (size - rare), rare - TYPO_TRIGRAMS, 1)
+        candidates = sorted(
+            ((count, i) for i, count in shared.items() if count >= fewest),
+            reverse=True,
+        )
+
+        # Score the most promising candidates first, raising the bar to
+        # the worst of the best limit found so far
+        best = []
+        bar = threshold
+        offsets = self.trigram_offsets
+        for _, i in candidates:
+            start, end = offsets[i], offsets[i + 1]
+            total = end - start
+            # Similarity is at most the ratio of the two trigram counts
+            if bar * total > size or bar * size > total:
+                continue
+            count = len(numbers.intersection(self.key_trigrams[start:end]))
+            score = count / (size + total - count)
+            if score < bar:
+                continue
+            if len(best) < limit:
+                heappush(best, (score, self.popularity[i], i))
+            else:
+                heappushpop(best, (score, self.popularity[i], i))
+            if len(best) == limit:
+                bar = max(threshold, best[0][0])
+        return [self._candidate(i, score)
+                for score, _, i in sorted(best, reverse=True)]
+
+    def candidates(self, name, limit=10):
+        """
+        Returns up to limit ranked candidates for name: exact matches
+        first, then prefix matches, then typo-tolerant matches.
+        """
+        results = self.exact(name)
+        seen = {candidate.person_id for candidate in results}
+        for candidate in self.prefix(name, limit) + self.fuzzy(name, limit):
+            if len(results) >= limit:
+                break
+            if candidate.person_id not in seen:
+                seen.add(candidate.person_id)
+                results.append(candidate)
+        return results[:limit]
+
+    def resolve(self, name, policy="strict"):
+        """
+        Returns a single person_id for name chosen by policy,
+        one of POLICIES, or None if the policy cannot choose.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"unknown name policy {policy!r}")
+        matches = self.exact(name)
+        if len(matches) == 1:
+            return matches[0].person_id
+        elif matches:
+            if policy == "strict":
+                return None
+            return matches[0].person_id
+        elif policy == "fuzzy":
+            for candidate in self.prefix(name, 1) + self.fuzzy(name, 1):
+                if candidate.score >= FUZZY_THRESHOLD:
+                    return candidate.person_id
+        return None
+
+    def _ranked(self, positions, score):
+        """Returns candidates for positions, most popular first."""
+        positions = sorted(positions,
+                           key=lambda i: self.popularity[i], reverse=True)
+        return [self._candidate(i, score) for i in positions]
+
+    def _candidate(self, i, score):
+        return Candidate(self.person_ids[i], self.names[i],
+                         self.births[i], score)
+
+
+def _trigrams(key):
+    """Returns the set of trigrams of key, padded at word boundaries."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
@@ -0,0 +1,167 @@
+"""
+Tic Tac Toe on bitboards
+
+A position is a pair of 9-bit masks (x, o), one per player, where bit
+3 * i + j is set if that player holds cell (i, j). Moves are cell
+numbers 0 to 8 in the same order.
+"""
+
+from tictactoe import X, O, EMPTY
+
+FULL = 0b111111111
+
+# Every row, column and diagonal as a mask of its three cells
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# Number of set bits for every 9-bit mask
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(FULL + 1))
+
+# Cell numbers of the empty cells for every mask of occupied cells
+EMPTY_CELLS = tuple(
+    tuple(cell for cell in range(9) if not occupied >> cell & 1)
+    for occupied in range(FULL + 1)
+)
+
+# Whether a player holding exactly these cells has three in a row
+WINNING = tuple(
+    any(mask & win == win for win in WIN_MASKS) for mask in range(FULL + 1)
+)
+
+
+def from_board(board):
+    """
+    Returns the (x, o) bitboards for a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the list-of-lists board for the (x, o) bitboards.
+    """
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1
+             else EMPTY for j in range(3)] for i in range(3)]
+
+
+def to_action(cell):
+    """Returns the (i, j) action for a cell number."""
+    return divmod(cell, 3)
+
+
+def to_cell(action):
+    """Returns the cell number for an (i, j) action."""
+    return 3 * action[0] + action[1]
+
+
+def player(x, o):
+    """
+    Returns player who has the next turn on a board.
+    """
+    return X if POPCOUNT[x] == POPCOUNT[o] else O
+
+
+def actions(x, o):
+    """
+    Returns the tuple of empty cell numbers on a board.
+    """
+    return EMPTY_CELLS[x | o]
+
+
+def result(x, o, cell):
+    """
+    Returns the (x, o) board that results from the current player
+    taking cell.
+    """
+    bit = 1 << cell
+    if (x | o) & bit:
+        raise Exception("This move is not allowed.")
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return x | bit, o
+    return x, o | bit
+
+
+def winner(x, o):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    if WINNING[x]:
+        return X
+    elif WINNING[o]:
+        return O
+    return None
+
+
+def terminal(x, o):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return WINNING[x] or WINNING[o] or (x | o) == FULL
+
+
+def utility(x, o):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    if WINNING[x]:
+        return 1
+    elif WINNING[o]:
+        return -1
+    return 0
+
+
+def value(x, o):
+    """
+    Returns the minimax value of the board with perfect play by
+    searching the full game tree below it.
+    """
+    # The player who just moved is the only one who can have won
+    if POPCOUNT[x] == POPCOUNT[o]:
+        if WINNING[o]:
+            return -1
+        if (x | o) == FULL:
+            return 0
+        best = -1
+        for cell in EMPTY_CELLS[x | o]:
+            v = value(x | 1 << cell, o)
+            if v == 1:
+                return 1
+            if v > best:
+                best = v
+        return best
+    else:
+        if WINNING[x]:
+            return 1
+        if (x | o) == FULL:
+            return 0
+        best = 1
+        for cell in EMPTY_CELLS[x | o]:
+            v = value(x, o | 1 << cell)
+            if v == -1:
+                return -1
+            if v < best:
+                best = v
+        return best
+
+
+def minimax(x, o):
+    """
+    Returns the optimal cell for the current player on the board,
+    or None if the game is over.
+    """
+    if terminal(x, o):
+        return None
+    cells = actions(x, o)
+    if POPCOUNT[x] == POPCOUNT[o]:
+        return max(cells, key=lambda cell: value(x | 1 << cell, o))
+    return min(cells, key=lambda cell: value(x, o | 1 << cell))
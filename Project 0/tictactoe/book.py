@@ -0,0 +1,51 @@
+"""
+Builds the opening book that tictactoe.minimax looks moves up in.
+
+Usage: python book.py [path]
+"""
+
+import os
+import sys
+
+import tictactoe as ttt
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [path]")
+    path = sys.argv[1] if len(sys.argv) == 2 else ttt.BOOK
+
+    entries = build()
+    # Replace the book only once it is complete, since tictactoe.py
+    # maps it into memory when imported
+    partial = f"{path}.partial"
+    with open(partial, "wb") as f:
+        f.write(ttt.BOOK_MAGIC)
+        f.write(entries)
+    os.replace(partial, path)
+    solved = sum(entry != ttt.NO_ENTRY for entry in entries)
+    print(f"Wrote best moves for {solved} positions to {path}.")
+
+
+def build():
+    """
+    Solves every position reachable from the initial state and returns
+    the book entries, indexed by tictactoe.book_key.
+    """
+    entries = bytearray([ttt.NO_ENTRY]) * ttt.BOOK_SIZE
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        key = ttt.book_key(board)
+        if entries[key] != ttt.NO_ENTRY or ttt.terminal(board):
+            continue
+        i, j = ttt.solve(board)
+        value = ttt.value(board)
+        entries[key] = (value + 1) << 4 | (3 * i + j)
+        for action in ttt.actions(board):
+            stack.append(ttt.result(board, action))
+    return entries
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+m,n,k Player
+
+Tic Tac Toe generalised to a board of m rows and n columns where
+k in a row wins, with a depth-limited search for boards too large
+to solve exhaustively.
+"""
+
+import time
+from functools import lru_cache
+
+from tictactoe import X, O, EMPTY
+
+# Score of a won position; quicker wins score slightly higher
+WIN = 1000000
+
+# Directions a line can run in from a cell: right, down and diagonals
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Boards with at most this many cells search every empty cell; larger
+# ones only search cells next to a piece already on the board
+SMALL_BOARD = 16
+
+
+class _Timeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+def initial_state(m=3, n=3):
+    """
+    Returns starting state of an m by n board.
+    """
+    return [[EMPTY] * n for _ in range(m)]
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    cells = [cell for row in board for cell in row]
+    return X if cells.count(X) == cells.count(O) else O
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    return {(i, j) for i, row in enumerate(board)
+            for j, cell in enumerate(row) if cell == EMPTY}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+    if not (0 <= i < len(board) and 0 <= j < len(board[0])):
+        raise Exception("This move is not within the board.")
+    if board[i][j] != EMPTY:
+        raise Exception("This move is not allowed.")
+    new = [list(row) for row in board]
+    new[i][j] = player(board)
+    return new
+
+
+@lru_cache(maxsize=None)
+def windows(m, n, k):
+    """
+    Returns every line of k cells on an m by n board, as a tuple of
+    (i, j) tuples.
+    """
+    lines = []
+    for i in range(m):
+        for j in range(n):
+            for di, dj in DIRECTIONS:
+                end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    lines.append(tuple((i + di * s, j + dj * s)
+                                       for s in range(k)))
+    return tuple(lines)
+
+
+def winner(board, k=3):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    for line in windows(len(board), len(board[0]), k):
+        first = board[line[0][0]][line[0][1]]
+        if first != EMPTY and all(board[i][j] == first for i, j in line):
+            return first
+    return None
+
+
+def terminal(board, k=3):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return winner(board, k) is not None or not actions(board)
+
+
+def utility(board, k=3):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    w = winner(board, k)
+    return 1 if w == X else -1 if w == O else 0
+
+
+def evaluate(board, k=3):
+    """
+    Returns a heuristic score of the board from X's point of view.
+
+    Every line of k cells that only one player has pieces in counts
+    for that player, weighted steeply by how many pieces it holds.
+    The score is kept strictly between -WIN and WIN, so that it is
+    never mistaken for a won or lost position.
+    """
+    score = 0
+    for line in windows(len(board), len(board[0]), k):
+        x_count = o_count = 0
+        for i, j in line:
+            cell = board[i][j]
+            if cell == X:
+                x_count += 1
+            elif cell == O:
+                o_count += 1
+        if x_count and not o_count:
+            score += 10 ** x_count
+        elif o_count and not x_count:
+            score -= 10 ** o_count
+    return max(-(WIN - 1), min(WIN - 1, score))
+
+
+def best_move(board, k=3, time_limit=1.0, max_depth=None):
+    """
+    Returns the best action found for the current player within
+    time_limit seconds, using iterative deepening alpha-beta search
+    with evaluate scoring positions at the depth limit.
+
+    Returns None if the game is over.
+    """
+    if terminal(board, k):
+        return None
+    deadline = time.perf_counter() + time_limit
+    board = [list(row) for row in board]
+    color = 1 if player(board) == X else -1
+    empty = len(actions(board))
+    max_depth = empty if max_depth is None else min(max_depth, empty)
+
+    move = None
+    for depth in range(1, max_depth + 1):
+        try:
+            value, move = _search_root(board, k, depth, color, move, deadline)
+        except _Timeout:
+            break
+        # A forced win or loss will not change with a deeper search
+        if abs(value) >= WIN:
+            break
+    if move is None:
+        move = _candidates(board)[0]
+    return move
+
+
+def _search_root(board, k, depth, color, first, deadline):
+    """
+    Searches every candidate move to depth, trying first before the
+    others, and returns the best score and move for color.
+    """
+    moves = _candidates(board)
+    if first in moves:
+        moves.remove(first)
+        moves.insert(0, first)
+
+    piece = X if color == 1 else O
+    best, move = -WIN * 2, moves[0]
+    alpha, beta = -WIN * 2, WIN * 2
+    for i, j in moves:
+        board[i][j] = piece
+        v = -_negamax(board, k, depth - 1, -beta, -alpha, -color,
+                      (i, j), deadline)
+        board[i][j] = EMPTY
+        if v > best:
+            best, move = v, (i, j)
+        alpha = max(alpha, v)
+    return best, move
+
+
+def _negamax(board, k, depth, alpha, beta, color, last, deadline):
+    """
+    Returns the score of the board for color, who is to move after
+    the opponent played last, searching depth more moves.
+    """
+    if time.perf_counter() > deadline:
+        raise _Timeout()
+
+    # Only the move just played can have completed a line
+    if _wins_at(board, last, k):
+        return -(WIN + depth)
+    moves = _candidates(board)
+    if not moves:
+        return 0
+    if depth == 0:
+        return color * evaluate(board, k)
+
+    piece = X if color == 1 else O
+    best = -WIN * 2
+    for i, j in moves:
+        board[i][j] = piece
+        v = -_negamax(board, k, depth - 1, -beta, -alpha, -color,
+                      (i, j), deadline)
+        board[i][j] = EMPTY
+        if v > best:
+            best = v
+        alpha = max(alpha, v)
+        if alpha >= beta:
+            break
+    return best
+
+
+def _wins_at(board, action, k):
+    """
+    Returns True if the piece at action is part of k in a row.
+    """
+    i, j = action
+    piece = board[i][j]
+    m, n = len(board), len(board[0])
+    for di, dj in DIRECTIONS:
+        count = 1
+        for sign in (1, -1):
+            r, c = i + sign * di, j + sign * dj
+            while 0 <= r < m and 0 <= c < n and board[r][c] == piece:
+                count += 1
+                r, c = r + sign * di, c + sign * dj
+        if count >= k:
+            return True
+    return False
+
+
+def _candidates(board):
+    """
+    Returns the empty cells worth searching, nearest to the center
+    first: every empty cell on small boards, otherwise those next to
+    an occupied cell, or just the center cell on an empty board.
+    """
+    m, n = len(board), len(board[0])
+    center = ((m - 1) / 2, (n - 1) / 2)
+    small = m * n <= SMALL_BOARD
+    moves = []
+    occupied = False
+    for i in range(m):
+        for j in range(n):
+            if board[i][j] != EMPTY:
+                occupied = True
+                continue
+            if small or any(board[r][c] != EMPTY
+                   for r in range(max(0, i - 1), min(m, i + 2))
+                   for c in range(max(0, j - 1), min(n, j + 2))):
+                moves.append((i, j))
+    if not occupied and not small:
+        return [(m // 2, n // 2)]
+    moves.sort(key=lambda move: abs(move[0] - center[0])
+               + abs(move[1] - center[1]))
+    return moves
@@ -0,0 +1,113 @@
+"""
+Headless Tic Tac Toe self-play
+
+Plays games between the AI and itself or a random player across
+several processes, checks that perfect play never loses and reports
+throughput and search statistics.
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+import tictactoe as ttt
+
+# Search functions the AI can use, by name
+ENGINES = {"minimax": ttt.minimax, "alphabeta": ttt.alphabeta}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Tic Tac Toe games without the pygame runner."
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--opponent", choices=("ai", "random"),
+                        default="random")
+    parser.add_argument("--engine", choices=sorted(ENGINES),
+                        default="minimax")
+    parser.add_argument("--workers", type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Split the games into one chunk per worker, each with its own seed
+    workers = max(1, min(args.workers, args.games))
+    chunks = [
+        (args.games // workers + (w < args.games % workers),
+         args.opponent, args.engine, args.seed + w)
+        for w in range(workers)
+    ]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        reports = pool.map(play_games, chunks)
+    elapsed = time.perf_counter() - start
+
+    total = {key: sum(report[key] for report in reports)
+             for key in reports[0]}
+    lookups = total["hits"] + total["misses"]
+    print(f"Games:       {total['games']} "
+          f"(X wins {total['x_wins']}, O wins {total['o_wins']}, "
+          f"ties {total['ties']})")
+    print(f"AI losses:   {total['ai_losses']}")
+    print(f"Games/sec:   {total['games'] / elapsed:.1f} "
+          f"on {workers} processes")
+    print(f"Nodes/move:  {total['nodes'] / max(1, total['ai_moves']):.1f}")
+    if lookups:
+        print(f"Cache hits:  {total['hits'] / lookups:.1%} "
+              f"of {lookups} lookups")
+    else:
+        print("Cache hits:  no lookups")
+    if total["book"]:
+        print(f"Book moves:  {total['book'] / total['ai_moves']:.1%} "
+              f"of AI moves, from {ttt.BOOK}")
+
+    if total["ai_losses"]:
+        sys.exit("Perfect play lost a game.")
+
+
+def play_games(chunk):
+    """
+    Plays a chunk of games, alternating which side the AI plays
+    against a random opponent, and returns totals of the outcomes
+    and search statistics.
+    """
+    games, opponent, engine, seed = chunk
+    rng = random.Random(seed)
+    search = ENGINES[engine]
+    report = dict.fromkeys(
+        ("games", "x_wins", "o_wins", "ties", "ai_losses",
+         "ai_moves", "nodes", "hits", "misses", "book"), 0
+    )
+    for game in range(games):
+        ai = ttt.X if game % 2 == 0 else ttt.O
+        board = ttt.initial_state()
+        while not ttt.terminal(board):
+            if opponent == "ai" or ttt.player(board) == ai:
+                before = dict(ttt.stats)
+                move = search(board)
+                report["ai_moves"] += 1
+                report["nodes"] += ttt.stats["nodes"]
+                for key in ("hits", "misses", "book"):
+                    report[key] += ttt.stats[key] - before[key]
+            else:
+                move = rng.choice(sorted(ttt.actions(board)))
+            board = ttt.result(board, move)
+
+        winner = ttt.winner(board)
+        report["games"] += 1
+        if winner == ttt.X:
+            report["x_wins"] += 1
+        elif winner == ttt.O:
+            report["o_wins"] += 1
+        else:
+            report["ties"] += 1
+        # Against itself perfect play must always end in a tie
+        if winner is not None and (opponent == "ai" or winner != ai):
+            report["ai_losses"] += 1
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Tic Tac Toe Player
 """
 
 import math
+import mmap
+import os
 import copy
 
 X = "X"
@@ -10,6 +12,50 @@ O = "O"
 EMPTY = None
 
 
+def _symmetries():
+    """
+    Returns the 8 rotations and reflections of the board, each given as
+    the cell (i, j) that moves to each position of the board row by row.
+    """
+    symmetries = []
+    for reflect in (False, True):
+        for turns in range(4):
+            cells = []
+            for row in range(3):
+                for column in range(3):
+                    i, j = row, (2 - column if reflect else column)
+                    for _ in range(turns):
+                        i, j = j, 2 - i
+                    cells.append((i, j))
+            symmetries.append(cells)
+    return symmetries
+
+
+SYMMETRIES = _symmetries()
+
+# Opening book written by book.py: BOOK_MAGIC, then one byte for each
+# board numbered by book_key, holding (value + 1) << 4 | cell of the best
+# move, or NO_ENTRY for terminal and unreachable boards
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_MAGIC = b"TTTBOOK1"
+BOOK_SIZE = 3 ** 9
+NO_ENTRY = 0xFF
+
+# Minimax values of positions already searched, keyed by canonical_key,
+# shared by every call to minimax
+transpositions = {}
+
+# Order in which alphabeta tries moves: center, then corners, then edges
+MOVE_ORDER = [(1, 1),
+              (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Transposition table lookups that found or missed a stored value, moves
+# minimax took from the opening book, and the number of positions
+# visited by the most recent minimax or alphabeta search
+stats = {"hits": 0, "misses": 0, "book": 0, "nodes": 0}
+
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -69,12 +115,14 @@ def winner(board):
     """
     #Transpose the board to exchange rows and colums
     tboard = list(zip(*board))
-    #Checks the rows
+    #Checks the rows and columns, skipping empty ones so they cannot hide a win
     for i in range(len(board)):
-        if board[i].count(board[i][0]) == len(board[i]):
-            return board[i][0]
-        elif tboard[i].count(tboard[i][0]) == len(tboard[i]):
-            return tboard[i][0]
+        row = board[i]
+        column = tboard[i]
+        if row[0] != EMPTY and row.count(row[0]) == len(row):
+            return row[0]
+        elif column[0] != EMPTY and column.count(column[0]) == len(column):
+            return column[0]
     #Check the diagonals
     dummy1 = []
     dummy2 = []
@@ -83,9 +131,9 @@ def winner(board):
         dummy1.append(board[i][i])
         dummy2.append(board[i][len(board)-1-i])
 
-    if dummy1.count(dummy1[0]) == len(dummy1):
+    if dummy1[0] != EMPTY and dummy1.count(dummy1[0]) == len(dummy1):
         return dummy1[0]
-    elif dummy2.count(dummy2[0]) == len(dummy2):
+    elif dummy2[0] != EMPTY and dummy2.count(dummy2[0]) == len(dummy2):
         return dummy2[0]
 
 def terminal(board):
@@ -110,51 +158,161 @@ def utility(board):
         return 0
 
 
+def canonical_key(board):
+    """
+    Returns a string encoding of the board that is the same for all
+    of its rotations and reflections.
+    """
+    return min(
+        "".join(board[i][j] or "-" for i, j in cells)
+        for cells in SYMMETRIES
+    )
+
+
+def value(board):
+    """
+    Returns the minimax value of the board with perfect play,
+    looking it up in the transposition table when already known.
+    """
+    stats["nodes"] += 1
+    key = canonical_key(board)
+    if key in transpositions:
+        stats["hits"] += 1
+        return transpositions[key]
+    stats["misses"] += 1
+
+    if terminal(board):
+        v = utility(board)
+    elif player(board) == X:
+        v = -1
+        for action in actions(board):
+            v = max(v, value(result(board, action)))
+            if v == 1:
+                break
+    else:
+        v = 1
+        for action in actions(board):
+            v = min(v, value(result(board, action)))
+            if v == -1:
+                break
+
+    transpositions[key] = v
+    return v
+
+
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
+    stats["nodes"] = 1
+    if terminal(board):
+        return None
+    if book is not None:
+        entry = book[len(BOOK_MAGIC) + book_key(board)]
+        if entry != NO_ENTRY:
+            stats["book"] += 1
+            return divmod(entry & 0x0F, 3)
+    return solve(board)
 
-    def max_value(board):
-        #If the game is over, return score and no move
-        if terminal(board):
-            return utility(board), None
-        
-        v = -42
-        move = None
 
-        for action in actions(board):
-            V, Move = min_value(result(board,action))
-            if V > v:
-                v = V
-                move = action
-                if v == 1:
-                    return v, move
-
-        return v, move
-
-    def min_value(board):
-        #If the game is over, return score and no move
-        if terminal(board):
-            return utility(board), None
-        
-        v = 42
-        move = None
+def solve(board):
+    """
+    Returns the optimal action for the current player on the board
+    by search, using the transposition table.
+    """
+    # Sort the moves so that ties are always broken the same way
+    moves = sorted(actions(board))
+    if player(board) == X:
+        return max(moves, key=lambda action: value(result(board, action)))
+    else:
+        return min(moves, key=lambda action: value(result(board, action)))
 
-        for action in actions(board):
-            V, Move = max_value(result(board,action))
-            if V < v:
-                v = V
-                move = action
-                if v == -1:
-                    return v, move
-
-        return v, move
-              
+
+def book_key(board):
+    """
+    Returns the board read row by row as a base 3 number, with
+    EMPTY, X and O as the digits 0, 1 and 2.
+    """
+    key = 0
+    for row in board:
+        for cell in row:
+            key = 3 * key + (0 if cell == EMPTY else 1 if cell == X else 2)
+    return key
+
+
+def load_book(path=BOOK):
+    """
+    Returns the opening book at path memory-mapped,
+    or None if there is no valid book there.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if (len(data) != len(BOOK_MAGIC) + BOOK_SIZE
+            or data[:len(BOOK_MAGIC)] != BOOK_MAGIC):
+        return None
+    return data
+
+
+def ordered_actions(board):
+    """
+    Returns the list of possible actions on the board in MOVE_ORDER.
+    """
+    return [action for action in MOVE_ORDER
+            if board[action[0]][action[1]] == EMPTY]
+
+
+def alphabeta(board):
+    """
+    Returns the optimal action for the current player on the board,
+    using minimax with alpha-beta pruning and a fixed move ordering
+    so that the same board always gives the same action.
+    """
+    stats["nodes"] = 1
     if terminal(board):
         return None
+
+    maximizing = player(board) == X
+    alpha, beta = -math.inf, math.inf
+    move = None
+    for action in ordered_actions(board):
+        v = alphabeta_value(result(board, action), alpha, beta)
+        if maximizing and v > alpha:
+            alpha, move = v, action
+        elif not maximizing and v < beta:
+            beta, move = v, action
+        if alpha >= beta:
+            break
+    return move
+
+
+def alphabeta_value(board, alpha, beta):
+    """
+    Returns the minimax value of the board if it lies between alpha
+    and beta, or a bound beyond whichever of them it falls outside.
+    """
+    stats["nodes"] += 1
+    if terminal(board):
+        return utility(board)
+
+    if player(board) == X:
+        v = -math.inf
+        for action in ordered_actions(board):
+            v = max(v, alphabeta_value(result(board, action), alpha, beta))
+            alpha = max(alpha, v)
+            if alpha >= beta:
+                break
     else:
-        if player(board) == X:
-            return max_value(board)[1]
-        else:
-            return min_value(board)[1]
\ No newline at end of file
+        v = math.inf
+        for action in ordered_actions(board):
+            v = min(v, alphabeta_value(result(board, action), alpha, beta))
+            beta = min(beta, v)
+            if alpha >= beta:
+                break
+    return v
+
+
+# Opening book for minimax, if book.py has been run
+book = load_book()
@@ -0,0 +1,110 @@
+"""
+Tic Tac Toe on arrays of boards
+
+Evaluates many boards at once with NumPy. Boards are int8 arrays of
+shape (N, 3, 3) holding 1 for X, -1 for O and 0 for EMPTY.
+"""
+
+import numpy as np
+
+from tictactoe import X, O, EMPTY
+
+# Every row, column and diagonal as the flat indices of its three cells
+LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+])
+
+# Value of each cell symbol in an array board
+CELL_VALUES = {X: 1, O: -1, EMPTY: 0}
+
+
+def from_boards(boards):
+    """
+    Returns an (N, 3, 3) int8 array for a list of list-of-lists boards.
+    """
+    return np.array(
+        [[[CELL_VALUES[cell] for cell in row] for row in board]
+         for board in boards],
+        dtype=np.int8,
+    ).reshape(-1, 3, 3)
+
+
+def to_boards(array):
+    """
+    Returns the list-of-lists boards for an (N, 3, 3) array.
+    """
+    symbols = {1: X, -1: O, 0: EMPTY}
+    return [[[symbols[cell] for cell in row] for row in board]
+            for board in array.tolist()]
+
+
+def line_sums(boards):
+    """
+    Returns an (N, 8) array of the sum of each line of each board,
+    which is 3 where X holds the line and -3 where O does.
+    """
+    flat = boards.reshape(-1, 9).astype(np.int8)
+    return flat[:, LINES].sum(axis=2, dtype=np.int8)
+
+
+def winner(boards):
+    """
+    Returns an int8 array holding 1 where X has won, -1 where O has
+    won and 0 where there is no winner.
+    """
+    sums = line_sums(boards)
+    x_won = (sums == 3).any(axis=1)
+    o_won = (sums == -3).any(axis=1)
+    return x_won.astype(np.int8) - o_won.astype(np.int8)
+
+
+def terminal(boards):
+    """
+    Returns a bool array that is True where the game is over.
+    """
+    full = (boards.reshape(-1, 9) != 0).all(axis=1)
+    return (winner(boards) != 0) | full
+
+
+def utility(boards):
+    """
+    Returns an int8 array of 1 where X has won, -1 where O has won
+    and 0 otherwise.
+    """
+    return winner(boards)
+
+
+def all_boards():
+    """
+    Returns every one of the 3 ** 9 ways of filling the board, in the
+    order of tictactoe.book_key.
+    """
+    keys = np.arange(3 ** 9)
+    powers = 3 ** np.arange(8, -1, -1)
+    digits = keys[:, None] // powers % 3
+    # Digits 0, 1 and 2 stand for EMPTY, X and O
+    cells = np.where(digits == 2, -1, digits).astype(np.int8)
+    return cells.reshape(-1, 3, 3)
+
+
+def all_positions():
+    """
+    Returns the 5478 boards that can occur in a game, in the order of
+    tictactoe.book_key, and an array of their keys.
+    """
+    boards = all_boards()
+    flat = boards.reshape(-1, 9)
+    x_count = (flat == 1).sum(axis=1)
+    o_count = (flat == -1).sum(axis=1)
+    sums = line_sums(boards)
+    x_won = (sums == 3).any(axis=1)
+    o_won = (sums == -3).any(axis=1)
+
+    # X moves first, and the game stops as soon as either side wins
+    legal = (x_count == o_count) | (x_count == o_count + 1)
+    legal &= ~x_won | (x_count == o_count + 1)
+    legal &= ~o_won | (x_count == o_count)
+    keys = np.flatnonzero(legal)
+    return boards[keys], keys
@@ -0,0 +1,97 @@
+"""
+Randomized check of the SAT backend
+
+Builds random sentences and checks that sat_check, model_check_all and
+KnowledgeBase with the SAT solver give the same answers as enumerating
+every model, stopping at the first disagreement.
+"""
+
+import argparse
+import random
+import sys
+
+from logic import (Symbol, Not, And, Or, Implication, Biconditional,
+                   KnowledgeBase, model_check, model_check_all, sat_check)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the SAT backend against model enumeration."
+    )
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--symbols", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbols = [Symbol(f"P{i}") for i in range(args.symbols)]
+    for trial in range(args.trials):
+        knowledge = random_sentence(rng, symbols, args.depth)
+        queries = [random_sentence(rng, symbols, args.depth - 1)
+                   for _ in range(3)]
+        error = check(knowledge, queries)
+        if error is not None:
+            print(f"Trial {trial}: {error}")
+            print(f"    knowledge: {knowledge.formula()}")
+            for query in queries:
+                print(f"    query:     {query.formula()}")
+            sys.exit(1)
+    print(f"{args.trials} trials agree with model enumeration.")
+
+
+def check(knowledge, queries):
+    """
+    Returns a description of the first way the SAT backend disagrees
+    with model enumeration on knowledge and queries, or None.
+    """
+    expected = [model_check(knowledge, query) for query in queries]
+    for query, entailed in zip(queries, expected):
+        if sat_check(knowledge, query) != entailed:
+            return f"sat_check gave {not entailed} for {query.formula()}"
+    if model_check_all(knowledge, queries, backend="sat") != expected:
+        return "model_check_all with the sat backend disagrees"
+
+    # Adding the conjuncts one at a time must give the same answers,
+    # and asking with the first assumed must match adding it
+    conjuncts = knowledge.conjuncts if isinstance(knowledge, And) else []
+    base = KnowledgeBase(*conjuncts)
+    if conjuncts and base.ask_all(queries) != expected:
+        return "KnowledgeBase built one sentence at a time disagrees"
+    base = KnowledgeBase()
+    assumed = [model_check(And(knowledge, queries[0]), query)
+               for query in queries]
+    base.add(knowledge)
+    if base.ask_all(queries, [queries[0]]) != assumed:
+        return "KnowledgeBase.ask_all with an assumption disagrees"
+
+    # A query asked, then extended, must be answered as it is now
+    query = And(queries[0])
+    base.ask(query)
+    query.add(queries[1])
+    if base.ask(query) != model_check(knowledge, query):
+        return "KnowledgeBase.ask answered for a query before it changed"
+    return None
+
+
+def random_sentence(rng, symbols, depth):
+    """Returns a random sentence over symbols nested up to depth."""
+    if depth <= 0 or rng.random() < 0.2:
+        return rng.choice(symbols)
+    kind = rng.randrange(5)
+    if kind == 0:
+        return Not(random_sentence(rng, symbols, depth - 1))
+    elif kind in (1, 2):
+        operands = [random_sentence(rng, symbols, depth - 1)
+                    for _ in range(rng.randint(1, 3))]
+        return And(*operands) if kind == 1 else Or(*operands)
+    elif kind == 3:
+        return Implication(random_sentence(rng, symbols, depth - 1),
+                           random_sentence(rng, symbols, depth - 1))
+    else:
+        return Biconditional(random_sentence(rng, symbols, depth - 1),
+                             random_sentence(rng, symbols, depth - 1))
+
+
+if __name__ == "__main__":
+    main()
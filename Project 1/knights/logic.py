@@ -1,8 +1,33 @@
+import hashlib
 import itertools
+import os
+import weakref
+
+from sat import Solver
+
+# Ways model_check can decide entailment
+BACKENDS = ("enumerate", "compiled", "table", "sat")
+
+# Every sentence built only from frozen parts, keyed by its class and
+# parts, so that building an equal sentence returns the same object
+_interned = weakref.WeakValueDictionary()
 
 
 class Sentence():
 
+    # A sentence is frozen if it can never change, which holds for every
+    # sentence without an And inside, since only And has an add method.
+    # Frozen sentences are shared and keep their hash and symbols; other
+    # sentences keep them only until the next call to And.add
+    __slots__ = ("frozen", "_hash", "_symbols", "_changes", "__weakref__")
+
+    # Number of calls to And.add so far
+    changes = 0
+
+    # Attributes that cache values computed from a sentence, and so are
+    # the only ones that can be set once it is built
+    _caches = frozenset(("_hash", "_symbols", "_changes"))
+
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
@@ -12,8 +37,92 @@ class Sentence():
         return ""
 
     def symbols(self):
-        """Returns a set of all symbols in the logical sentence."""
-        return set()
+        """Returns a frozenset of all symbols in the logical sentence."""
+        self._refresh()
+        if self._symbols is None:
+            self._symbols = frozenset().union(
+                *[child.symbols() for child in self._children()]
+            )
+        return self._symbols
+
+    def compile(self, variables):
+        """
+        Returns a function that evaluates the logical sentence in a
+        model given as an integer, where bit variables[name] is the
+        value of the symbol called name.
+        """
+        raise Exception("nothing to compile")
+
+    def __hash__(self):
+        self._refresh()
+        if self._hash is None:
+            self._hash = hash(self._key())
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), self._arguments())
+
+    def __setattr__(self, name, value):
+        # Equal sentences are shared, so changing one would change all
+        if name not in Sentence._caches:
+            raise AttributeError(
+                f"cannot set {name!r}: sentences are immutable"
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            f"cannot delete {name!r}: sentences are immutable"
+        )
+
+    def _arguments(self):
+        """Returns the arguments the sentence was built from."""
+        return ()
+
+    def _children(self):
+        """Returns the sentences the sentence was built from."""
+        return [argument for argument in self._arguments()
+                if isinstance(argument, Sentence)]
+
+    def _key(self):
+        """Returns the tuple the sentence's hash is computed from."""
+        return ()
+
+    def _refresh(self):
+        """
+        Forgets the hash and symbols of a sentence that is not frozen
+        if an And has changed since they were computed.
+        """
+        if not self.frozen and self._changes != Sentence.changes:
+            self._hash = None
+            self._symbols = None
+            self._changes = Sentence.changes
+
+    @classmethod
+    def _shared(cls, children, **fields):
+        """
+        Returns a sentence of class cls with fields set, reusing the
+        existing one with the same fields if children are all frozen.
+        """
+        frozen = all(child.frozen for child in children)
+        if frozen:
+            key = (cls,) + tuple(
+                id(value) if isinstance(value, Sentence) else value
+                for value in _flatten(fields.values())
+            )
+            sentence = _interned.get(key)
+            if sentence is not None:
+                return sentence
+        sentence = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(sentence, name, value)
+        object.__setattr__(sentence, "frozen", frozen)
+        sentence._hash = None
+        sentence._symbols = None
+        sentence._changes = Sentence.changes
+        if frozen:
+            _interned[key] = sentence
+        return sentence
 
     @classmethod
     def validate(cls, sentence):
@@ -42,16 +151,42 @@ class Sentence():
             return f"({s})"
 
 
+def _structure(sentence):
+    """
+    Returns a string that differs for any two different sentences,
+    unlike repr, which leaves symbol names unquoted.
+    """
+    parts = [_structure(argument) if isinstance(argument, Sentence)
+             else repr(argument) for argument in sentence._arguments()]
+    return f"{type(sentence).__name__}({', '.join(parts)})"
+
+
+def _flatten(values):
+    """Yields values, with the items of tuples in place of the tuples."""
+    for value in values:
+        if isinstance(value, tuple):
+            yield from value
+        else:
+            yield value
+
+
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    __slots__ = ("name",)
+
+    def __new__(cls, name):
+        symbol = cls._shared((), name=name)
+        if symbol._symbols is None:
+            symbol._symbols = frozenset((name,))
+        return symbol
 
     def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+        return self is other or (
+            isinstance(other, Symbol) and self.name == other.name
+        )
 
     def __hash__(self):
-        return hash(("symbol", self.name))
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         return self.name
@@ -65,20 +200,35 @@ class Symbol(Sentence):
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def compile(self, variables):
+        try:
+            bit = 1 << variables[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+        return lambda model: model & bit != 0
+
+    def _arguments(self):
+        return (self.name,)
+
+    def _key(self):
+        return ("symbol", self.name)
 
 
 class Not(Sentence):
-    def __init__(self, operand):
+
+    __slots__ = ("operand",)
+
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+        return cls._shared((operand,), operand=operand)
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (
+            isinstance(other, Not) and self.operand == other.operand
+        )
 
     def __hash__(self):
-        return hash(("not", hash(self.operand)))
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -89,23 +239,38 @@ class Not(Sentence):
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
-        return self.operand.symbols()
+    def compile(self, variables):
+        operand = self.operand.compile(variables)
+        return lambda model: not operand(model)
+
+    def _arguments(self):
+        return (self.operand,)
+
+    def _key(self):
+        return ("not", hash(self.operand))
 
 
 class And(Sentence):
+
+    # And is the one sentence that can change, so it is never shared
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
+        object.__setattr__(self, "conjuncts", list(conjuncts))
+        object.__setattr__(self, "frozen", False)
+        self._hash = None
+        self._symbols = None
+        self._changes = Sentence.changes
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -116,6 +281,7 @@ class And(Sentence):
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        Sentence.changes += 1
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
@@ -126,23 +292,44 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def compile(self, variables):
+        conjuncts = [c.compile(variables) for c in self.conjuncts]
+        if len(conjuncts) == 1:
+            return conjuncts[0]
+        if len(conjuncts) == 2:
+            first, second = conjuncts
+            return lambda model: first(model) and second(model)
+
+        def evaluate(model):
+            for conjunct in conjuncts:
+                if not conjunct(model):
+                    return False
+            return True
+        return evaluate
+
+    def _arguments(self):
+        return tuple(self.conjuncts)
+
+    def _key(self):
+        return ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls._shared(disjuncts, disjuncts=disjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -157,24 +344,47 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def compile(self, variables):
+        disjuncts = [d.compile(variables) for d in self.disjuncts]
+        if len(disjuncts) == 1:
+            return disjuncts[0]
+        if len(disjuncts) == 2:
+            first, second = disjuncts
+            return lambda model: first(model) or second(model)
+
+        def evaluate(model):
+            for disjunct in disjuncts:
+                if disjunct(model):
+                    return True
+            return False
+        return evaluate
+
+    def _arguments(self):
+        return self.disjuncts
+
+    def _key(self):
+        return ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls._shared((antecedent, consequent),
+                           antecedent=antecedent, consequent=consequent)
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (
+            isinstance(other, Implication)
+            and self.antecedent == other.antecedent
+            and self.consequent == other.consequent
+        )
 
     def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -188,24 +398,36 @@ class Implication(Sentence):
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def compile(self, variables):
+        antecedent = self.antecedent.compile(variables)
+        consequent = self.consequent.compile(variables)
+        return lambda model: not antecedent(model) or consequent(model)
+
+    def _arguments(self):
+        return (self.antecedent, self.consequent)
+
+    def _key(self):
+        return ("implies", hash(self.antecedent), hash(self.consequent))
 
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls._shared((left, right), left=left, right=right)
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (
+            isinstance(other, Biconditional)
+            and self.left == other.left
+            and self.right == other.right
+        )
 
     def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+        return Sentence.__hash__(self)
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -221,12 +443,39 @@ class Biconditional(Sentence):
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
-
-
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    def compile(self, variables):
+        left = self.left.compile(variables)
+        right = self.right.compile(variables)
+        # Each side is evaluated once and the results compared
+        return lambda model: left(model) == right(model)
+
+    def _arguments(self):
+        return (self.left, self.right)
+
+    def _key(self):
+        return ("biconditional", hash(self.left), hash(self.right))
+
+
+def model_check(knowledge, query, backend="enumerate"):
+    """
+    Checks if knowledge base entails query.
+
+    The "enumerate" backend checks every model of the symbols; the
+    "compiled" backend does the same with compiled sentences over
+    integer models; the "table" backend builds truth tables of every
+    model at once with NumPy (see truthtable.py); the "sat" backend
+    asks a SAT solver whether knowledge ∧ ¬query has a model, which
+    scales to far more symbols.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}")
+    if backend == "compiled":
+        return compiled_check(knowledge, query)
+    if backend == "table":
+        import truthtable
+        return truthtable.check(knowledge, query)[0]
+    if backend == "sat":
+        return sat_check(knowledge, query)
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
@@ -257,7 +506,326 @@ def model_check(knowledge, query):
                     check_all(knowledge, query, remaining, model_false))
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = set(knowledge.symbols() | query.symbols())
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def compiled_check(knowledge, query):
+    """
+    Checks if knowledge base entails query by compiling both and
+    evaluating them in every model, each model being the integer
+    whose bits are the values of the symbols.
+    """
+    symbols = sorted(knowledge.symbols() | query.symbols())
+    variables = {name: i for i, name in enumerate(symbols)}
+    knowledge = knowledge.compile(variables)
+    query = query.compile(variables)
+    for model in range(1 << len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query by showing with a SAT
+    solver that knowledge ∧ ¬query is unsatisfiable.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not cnf.solver().solve()
+
+
+def model_check_all(knowledge, queries, backend="enumerate"):
+    """
+    Returns a list saying, for each query in order, whether the
+    knowledge base entails it, using one of BACKENDS.
+
+    Rather than checking each query separately, the models of the
+    knowledge base are gone through once, and a query stays entailed
+    only while it is true in every one of them.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}")
+    queries = list(queries)
+    if backend == "sat":
+        return _sat_check_all(knowledge, queries)
+
+    symbols = sorted(knowledge.symbols().union(
+        *[query.symbols() for query in queries]
+    ))
+    if backend == "table":
+        import truthtable
+        table = truthtable.TruthTable(symbols)
+        return table.entails_all(knowledge, queries)
+
+    entailed = [True] * len(queries)
+    if backend == "compiled":
+        variables = {name: i for i, name in enumerate(symbols)}
+        holds = knowledge.compile(variables)
+        checks = [query.compile(variables) for query in queries]
+        models = range(1 << len(symbols))
+    else:
+        holds = knowledge.evaluate
+        checks = [query.evaluate for query in queries]
+        models = (dict(zip(symbols, values)) for values in
+                  itertools.product((True, False), repeat=len(symbols)))
+
+    # Indices of the queries that have held in every model so far
+    remaining = list(range(len(queries)))
+    for model in models:
+        if not remaining:
+            break
+        if holds(model):
+            for i in remaining:
+                if not checks[i](model):
+                    entailed[i] = False
+            remaining = [i for i in remaining if entailed[i]]
+    return entailed
+
+
+def _sat_check_all(knowledge, queries):
+    """Checks each query against the knowledge base with one SAT solver."""
+    return KnowledgeBase(knowledge).ask_all(queries)
+
+class CNF():
+    """
+    Conjunctive normal form of sentences, built with the Tseitin
+    transformation: every compound subsentence gets a fresh variable
+    defined by a few clauses, so the clauses grow linearly with the
+    sentence and are satisfiable exactly when the sentence is.
+
+    Variables are the integers from 1, and a literal is a variable or
+    its negation, as in DIMACS files.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        # Maps symbol names to their variables, and back
+        self.variables = {}
+        self.names = {}
+        self.count = 0
+        # Maps frozen subsentences already encoded to their literals; an
+        # And can still gain conjuncts, so it is encoded again each time
+        self.literals = {}
+
+    def variable(self, name=None):
+        """
+        Returns the variable of the symbol called name, or a fresh
+        variable if name is None.
+        """
+        if name is not None and name in self.variables:
+            return self.variables[name]
+        self.count += 1
+        if name is not None:
+            self.variables[name] = self.count
+            self.names[self.count] = name
+        return self.count
+
+    def add(self, sentence):
+        """Adds clauses that hold exactly when sentence is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append(
+                [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            )
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """
+        Returns a literal that is true exactly when sentence is,
+        adding the clauses that define it.
+        """
+        if sentence.frozen and sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, Symbol):
+            literal = self.variable(sentence.name)
+        elif isinstance(sentence, Not):
+            literal = -self.literal(sentence.operand)
+        elif isinstance(sentence, And):
+            operands = [self.literal(c) for c in sentence.conjuncts]
+            literal = self.variable()
+            self.clauses.extend([-literal, operand] for operand in operands)
+            self.clauses.append([literal] + [-operand for operand in operands])
+        elif isinstance(sentence, Or):
+            operands = [self.literal(d) for d in sentence.disjuncts]
+            literal = self.variable()
+            self.clauses.append([-literal] + operands)
+            self.clauses.extend([literal, -operand] for operand in operands)
+        elif isinstance(sentence, Implication):
+            a = self.literal(sentence.antecedent)
+            b = self.literal(sentence.consequent)
+            literal = self.variable()
+            self.clauses.extend([[-literal, -a, b], [literal, a],
+                                 [literal, -b]])
+        elif isinstance(sentence, Biconditional):
+            a = self.literal(sentence.left)
+            b = self.literal(sentence.right)
+            literal = self.variable()
+            self.clauses.extend([[-literal, -a, b], [-literal, a, -b],
+                                 [literal, a, b], [literal, -a, -b]])
+        else:
+            raise TypeError("must be a logical sentence")
+
+        if sentence.frozen:
+            self.literals[sentence] = literal
+        return literal
+
+    def solver(self):
+        """Returns a SAT solver loaded with the clauses."""
+        solver = Solver()
+        solver.reserve(self.count)
+        for clause in self.clauses:
+            solver.add_clause(clause)
+        return solver
+
+    def to_dimacs(self):
+        """
+        Returns the clauses in DIMACS format, with a comment line
+        naming the symbol of each symbol variable.
+        """
+        lines = [f"c var {variable} {name}"
+                 for variable, name in sorted(self.names.items())]
+        lines.append(f"p cnf {self.count} {len(self.clauses)}")
+        lines.extend(" ".join(map(str, clause)) + " 0"
+                     for clause in self.clauses)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Writes the clauses to path in DIMACS format, replacing the
+        file only once it is complete so readers never see part of it.
+        """
+        partial = f"{path}.partial"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(self.to_dimacs())
+        os.replace(partial, path)
+
+    @classmethod
+    def read(cls, path):
+        """
+        Returns the CNF in the DIMACS file at path, restoring
+        symbol names from its comment lines.
+        """
+        cnf = cls()
+        clause = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("c var "):
+                    variable, name = line[6:].rstrip("\n").split(" ", 1)
+                    cnf.variables[name] = int(variable)
+                    cnf.names[int(variable)] = name
+                elif line.startswith("p cnf "):
+                    cnf.count = int(line.split()[2])
+                elif line.strip() and not line.startswith("c"):
+                    for literal in map(int, line.split()):
+                        if literal == 0:
+                            cnf.clauses.append(clause)
+                            clause = []
+                        else:
+                            clause.append(literal)
+        return cnf
+
+    @classmethod
+    def cached(cls, sentence, directory):
+        """
+        Returns the CNF of sentence, read from a DIMACS file in
+        directory named after a hash of the sentence if one exists,
+        otherwise compiled and written there for next time.
+        """
+        digest = hashlib.sha256(
+            _structure(sentence).encode("utf-8")
+        ).hexdigest()
+        path = os.path.join(directory, f"{digest[:16]}.cnf")
+        if os.path.exists(path):
+            return cls.read(path)
+        cnf = cls()
+        cnf.add(sentence)
+        os.makedirs(directory, exist_ok=True)
+        cnf.write(path)
+        return cnf
+
+
+class KnowledgeBase():
+    """
+    Knowledge that grows one sentence at a time, kept as clauses in a
+    single SAT solver, so that questions asked after each new sentence
+    reuse the clauses already encoded and those learned before.
+    """
+
+    def __init__(self, *sentences):
+        self.knowledge = And()
+        self.cnf = CNF()
+        self.solver = Solver()
+        # Number of clauses of cnf already given to solver
+        self.loaded = 0
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence to the knowledge base."""
+        self.knowledge.add(sentence)
+        self.cnf.add(sentence)
+        self._load()
+
+    def ask(self, query, assumptions=()):
+        """
+        Returns True if the knowledge base entails query when every
+        sentence in assumptions is also taken to be true. Assumptions
+        only hold for this question and are not added.
+        """
+        assumed = self._literals(assumptions)
+        return not self.solver.solve(assumed + [-self.literal(query)])
+
+    def ask_all(self, queries, assumptions=()):
+        """
+        Returns a list saying whether the knowledge base entails each
+        query under assumptions. A query false in any model found is
+        not entailed, and the others are checked in turn by solving
+        with the query assumed false, which either finds another model
+        to rule out more queries or shows the query is entailed.
+        """
+        assumed = self._literals(assumptions)
+        literals = self._literals(queries)
+        if not self.solver.solve(assumed):
+            return [True] * len(literals)
+
+        entailed = [True] * len(literals)
+        model = self.solver.model
+        for i, literal in enumerate(literals):
+            if model is not None:
+                # Queries false in the latest model are not entailed
+                for j in range(i, len(literals)):
+                    if model[abs(literals[j])] != (literals[j] > 0):
+                        entailed[j] = False
+                model = None
+            if entailed[i] and self.solver.solve(assumed + [-literal]):
+                entailed[i] = False
+                model = self.solver.model
+        return entailed
+
+    def literal(self, sentence):
+        """
+        Returns a literal of the solver that is true exactly when
+        sentence is, encoding sentence if it is new.
+        """
+        literal = self.cnf.literal(sentence)
+        self._load()
+        return literal
+
+    def _literals(self, sentences):
+        return [self.literal(sentence) for sentence in sentences]
+
+    def _load(self):
+        """Gives the solver the clauses it has not seen yet."""
+        self.solver.reserve(self.cnf.count)
+        for clause in self.cnf.clauses[self.loaded:]:
+            self.solver.add_clause(clause)
+        self.loaded = len(self.cnf.clauses)
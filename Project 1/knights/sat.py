@@ -0,0 +1,303 @@
+"""
+Boolean satisfiability
+
+A conflict-driven clause learning (CDCL) solver. Clauses are lists of
+integer literals as in DIMACS files: variable v appears as v when it
+must be true and as -v when it must be false.
+"""
+
+import heapq
+
+# Activity scores are multiplied by this after every conflict, so that
+# variables involved in recent conflicts are branched on first
+DECAY = 0.95
+
+# Conflicts before the first restart; each later restart waits longer
+RESTART = 100
+RESTART_GROWTH = 1.5
+
+
+class Solver():
+    """
+    Incremental SAT solver with unit propagation over two watched
+    literals per clause, first-UIP clause learning, activity-based
+    branching and restarts. Clauses and learned clauses are kept
+    between calls to solve.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        # Maps each literal to the indices of clauses watching it
+        self.watches = {}
+        # Per variable, indexed from 1: value, decision level at which
+        # it was assigned, clause that implied it, activity and the
+        # value it last had
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.activity = [0.0]
+        self.phases = [False]
+        # Heap of (-activity, variable) to choose branches from; entries
+        # go stale as activities change and are skipped once assigned
+        self.order = []
+        # Assigned literals in order, and where each decision level starts
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        self.increment = 1.0
+        # False once the clauses are unsatisfiable without assumptions
+        self.ok = True
+        self.model = None
+
+    def reserve(self, variable):
+        """Makes room for variables up to variable."""
+        while len(self.values) <= variable:
+            self.values.append(None)
+            self.levels.append(0)
+            self.reasons.append(None)
+            self.activity.append(0.0)
+            self.phases.append(False)
+            heapq.heappush(self.order, (0.0, len(self.values) - 1))
+
+    def add_clause(self, clause):
+        """
+        Adds a clause. Returns False if the clauses are now known to
+        be unsatisfiable, True otherwise.
+        """
+        if not self.ok:
+            return False
+        self._backtrack(0)
+
+        literals = []
+        for literal in clause:
+            self.reserve(abs(literal))
+            value = self._value(literal)
+            if value is True or -literal in literals:
+                return True
+            if value is None and literal not in literals:
+                literals.append(literal)
+
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self._assign(literals[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(literals)
+        return self.ok
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses are satisfiable with every literal
+        in assumptions true, storing a satisfying assignment in model
+        as a dictionary from variable to bool, or False if not.
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        for literal in assumptions:
+            self.reserve(abs(literal))
+
+        limit = RESTART
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                if not self.trail_limits:
+                    self.ok = False
+                    return False
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learned) == 1:
+                    self._assign(learned[0], None)
+                else:
+                    self._assign(learned[0], self._attach(learned))
+                self.increment /= DECAY
+                conflicts += 1
+                continue
+
+            if conflicts >= limit:
+                conflicts = 0
+                limit *= RESTART_GROWTH
+                self._backtrack(0)
+                continue
+
+            # Assumptions are decided first, one per decision level
+            literal = None
+            while len(self.trail_limits) < len(assumptions):
+                assumption = assumptions[len(self.trail_limits)]
+                value = self._value(assumption)
+                if value is False:
+                    self._backtrack(0)
+                    return False
+                self.trail_limits.append(len(self.trail))
+                if value is None:
+                    literal = assumption
+                    break
+
+            if literal is None:
+                variable = self._choose()
+                if variable is None:
+                    self.model = {
+                        v: self.values[v] for v in range(1, len(self.values))
+                        if self.values[v] is not None
+                    }
+                    self._backtrack(0)
+                    return True
+                literal = variable if self.phases[variable] else -variable
+                self.trail_limits.append(len(self.trail))
+            self._assign(literal, None)
+
+    def _value(self, literal):
+        """Returns the value of a literal, or None if unassigned."""
+        value = self.values[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def _attach(self, clause):
+        """Stores a clause, watching its first two literals."""
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches.setdefault(clause[0], []).append(index)
+        self.watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def _backtrack(self, level):
+        """Undoes every assignment made above decision level."""
+        if len(self.trail_limits) <= level:
+            return
+        start = self.trail_limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = self.values[variable]
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_limits[level:]
+        self.head = min(self.head, start)
+        if len(self.order) > 4 * len(self.values):
+            self._rebuild_order()
+
+    def _propagate(self):
+        """
+        Assigns every literal forced by a clause with one unassigned
+        literal left. Returns the index of a clause whose literals are
+        all false, or None if there is no conflict.
+        """
+        clauses = self.clauses
+        value = self._value
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches.get(false)
+            if not watching:
+                continue
+            kept = []
+            for position, index in enumerate(watching):
+                clause = clauses[index]
+                # Keep the literal that just became false second
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                other = clause[0]
+                if value(other) is True:
+                    kept.append(index)
+                    continue
+
+                # Look for another literal that is not false to watch
+                for k in range(2, len(clause)):
+                    if value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], false
+                        self.watches.setdefault(clause[1], []).append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if value(other) is False:
+                        kept.extend(watching[position + 1:])
+                        self.watches[false] = kept
+                        return index
+                    self._assign(other, index)
+            self.watches[false] = kept
+        return None
+
+    def _analyze(self, conflict):
+        """
+        Returns a learned clause that is asserting at the first unique
+        implication point of a conflict, with the asserted literal
+        first, and the decision level to go back to.
+        """
+        level = len(self.trail_limits)
+        learned = [None]
+        seen = set()
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                if literal is not None and variable == abs(literal):
+                    continue
+                seen.add(variable)
+                self._bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Walk back to the most recent literal involved in the conflict
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+        learned[0] = -literal
+
+        if len(learned) == 1:
+            return learned, 0
+        # Watch the literal that will be unassigned last
+        deepest = max(range(1, len(learned)),
+                      key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def _bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self._rebuild_order()
+        elif self.values[variable] is None:
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+
+    def _rebuild_order(self):
+        """Rebuilds the branching heap without stale entries."""
+        self.order = [(-self.activity[v], v)
+                      for v in range(1, len(self.values))
+                      if self.values[v] is None]
+        heapq.heapify(self.order)
+
+    def _choose(self):
+        """
+        Returns an unassigned variable with the highest activity, or
+        None if every variable is assigned.
+        """
+        while self.order:
+            _, variable = heapq.heappop(self.order)
+            if self.values[variable] is None:
+                return variable
+        return None
@@ -0,0 +1,143 @@
+"""
+Truth tables with NumPy
+
+The truth table of a sentence over n symbols is a packed array of 2^n
+bits, bit m being the value of the sentence in model m, where bit i of
+m is the value of the i-th symbol. Tables are combined with bitwise
+array operations, 64 models at a time.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+# Most symbols a table is built for; each table takes 2^n / 8 bytes,
+# which is 2 MB at 24 symbols
+MAX_SYMBOLS = 24
+
+ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Within one 64-bit word, the bits of the models in which each of the
+# first six symbols is true
+WORD_PATTERNS = (
+    0xAAAAAAAAAAAAAAAA, 0xCCCCCCCCCCCCCCCC, 0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00, 0xFFFF0000FFFF0000, 0xFFFFFFFF00000000,
+)
+
+
+class TruthTable():
+    """
+    Truth tables of sentences over a fixed list of symbols. The
+    tables of symbols, of sentences asked for and of subsentences
+    that appear more than once are kept, while the rest are dropped
+    once the sentence that contains them is built. Tables are only
+    kept for frozen sentences, since an And can still gain conjuncts.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = list(symbols)
+        if len(self.symbols) > MAX_SYMBOLS:
+            raise ValueError(
+                f"{len(self.symbols)} symbols is more than {MAX_SYMBOLS}"
+            )
+        models = 1 << len(self.symbols)
+        words = max(1, models // 64)
+
+        # Bits of the last word past the last model are never set
+        self.valid = np.full(words, ONES)
+        if models < 64:
+            self.valid[0] = np.uint64((1 << models) - 1)
+
+        self.tables = {}
+        index = np.arange(words, dtype=np.uint64)
+        for i, name in enumerate(self.symbols):
+            if i < 6:
+                column = np.full(words, np.uint64(WORD_PATTERNS[i]))
+            else:
+                bit = (index >> np.uint64(i - 6)) & np.uint64(1)
+                column = np.where(bit == 1, ONES, np.uint64(0))
+            self.tables[Symbol(name)] = column & self.valid
+
+    def table(self, sentence):
+        """Returns the packed truth table of sentence."""
+        if sentence.frozen and sentence in self.tables:
+            return self.tables[sentence]
+        uses = Counter()
+        self._count_uses(sentence, uses)
+        table = self._build(sentence, uses)
+        if sentence.frozen:
+            self.tables[sentence] = table
+        return table
+
+    def _count_uses(self, sentence, uses):
+        """
+        Counts in uses how many sentences refer to each subsentence of
+        sentence whose table is not kept yet.
+        """
+        uses[sentence] += 1
+        if uses[sentence] == 1 and not (sentence.frozen
+                                        and sentence in self.tables):
+            for child in sentence._children():
+                self._count_uses(child, uses)
+
+    def _build(self, sentence, uses):
+        """
+        Returns the packed truth table of sentence, keeping it if the
+        sentence is frozen and used more than once.
+        """
+        if sentence.frozen and sentence in self.tables:
+            return self.tables[sentence]
+
+        def table(child):
+            return self._build(child, uses)
+
+        if isinstance(sentence, Symbol):
+            raise Exception(f"variable {sentence.name} not in model")
+        elif isinstance(sentence, Not):
+            result = ~table(sentence.operand)
+        elif isinstance(sentence, And):
+            result = self.valid.copy()
+            for conjunct in sentence.conjuncts:
+                result &= table(conjunct)
+        elif isinstance(sentence, Or):
+            result = np.zeros_like(self.valid)
+            for disjunct in sentence.disjuncts:
+                result |= table(disjunct)
+        elif isinstance(sentence, Implication):
+            result = ~table(sentence.antecedent) | table(sentence.consequent)
+        elif isinstance(sentence, Biconditional):
+            result = ~(table(sentence.left) ^ table(sentence.right))
+        else:
+            raise TypeError("must be a logical sentence")
+
+        result &= self.valid
+        if sentence.frozen and uses[sentence] > 1:
+            self.tables[sentence] = result
+        return result
+
+    def count(self, sentence):
+        """Returns the number of models in which sentence is true."""
+        return int(np.unpackbits(self.table(sentence).view(np.uint8)).sum())
+
+    def entails(self, knowledge, query):
+        """Returns True if query is true in every model of knowledge."""
+        return self.entails_all(knowledge, [query])[0]
+
+    def entails_all(self, knowledge, queries):
+        """
+        Returns a list saying whether knowledge entails each query,
+        building the table of knowledge once.
+        """
+        known = self.table(knowledge)
+        return [not (known & ~self.table(query)).any() for query in queries]
+
+
+def check(knowledge, query):
+    """
+    Returns whether knowledge entails query, and the number of models
+    of the symbols of both in which knowledge is true.
+    """
+    table = TruthTable(sorted(knowledge.symbols() | query.symbols()))
+    return table.entails(knowledge, query), table.count(knowledge)